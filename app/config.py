@@ -14,3 +14,86 @@ LANGCHAIN_TRACING = os.getenv("LANGCHAIN_TRACING", "true")
 MODEL_NAME = "gpt-4o-mini"
 TEMPERATURE = 0
 COLLECTION_NAME = "resumes"
+
+# Runtime caches live in the user's cache directory, not in the source tree
+CACHE_DIR = os.getenv(
+    "CACHE_DIR", os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "rag-resume-agent")
+)
+
+# Embeddings
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIR, "embeddings.sqlite"))
+EMBEDDING_CACHE_MAX_MB = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "256"))
+
+# Vector store
+VECTORSTORE_IDLE_TTL_S = float(os.getenv("VECTORSTORE_IDLE_TTL_S", "3600"))
+# Per-resume collections: "numpy" (in-process matrix) or "chroma" (persistent HNSW)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "numpy").lower()
+VECTOR_DTYPE = os.getenv("VECTOR_DTYPE", "float32")  # float16 halves memory
+
+# Routing
+ROUTING_SIMILARITY_THRESHOLD = float(os.getenv("ROUTING_SIMILARITY_THRESHOLD", "0.55"))
+
+# Chat history: recent turns verbatim within the budget, older turns in a rolling summary
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "1200"))
+HISTORY_SUMMARY_BATCH_TOKENS = int(os.getenv("HISTORY_SUMMARY_BATCH_TOKENS", "400"))
+
+# Context packing for generation/grading prompts
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2500"))
+CONTEXT_MMR_LAMBDA = float(os.getenv("CONTEXT_MMR_LAMBDA", "0.7"))
+
+# Web search: "tavily" or "offline" (local stand-in, see core.web_search.OfflineSearchTool)
+WEB_SEARCH_PROVIDER = os.getenv("WEB_SEARCH_PROVIDER", "tavily").lower()
+WEB_SEARCH_OFFLINE_PATH = os.getenv("WEB_SEARCH_OFFLINE_PATH", "")
+WEB_SEARCH_TIMEOUT_S = float(os.getenv("WEB_SEARCH_TIMEOUT_S", "8"))
+WEB_SEARCH_CACHE_TTL_S = float(os.getenv("WEB_SEARCH_CACHE_TTL_S", "3600"))
+WEB_SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("WEB_SEARCH_CACHE_MAX_ENTRIES", "1000"))
+
+# Semantic answer cache
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+ANSWER_CACHE_TTL_S = float(os.getenv("ANSWER_CACHE_TTL_S", "3600"))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000"))
+
+# Skills comparison / resume suggestions, cached by (resume hash, JD hash)
+SKILLS_CACHE_TTL_S = float(os.getenv("SKILLS_CACHE_TTL_S", "86400"))
+SKILLS_CACHE_MAX_ENTRIES = int(os.getenv("SKILLS_CACHE_MAX_ENTRIES", "512"))
+PREFETCH_SUGGESTIONS = os.getenv("PREFETCH_SUGGESTIONS", "true").lower() == "true"
+
+# Generation grading policy
+MAX_GENERATION_RETRIES = int(os.getenv("MAX_GENERATION_RETRIES", "2"))
+REQUEST_LATENCY_BUDGET_S = float(os.getenv("REQUEST_LATENCY_BUDGET_S", "30"))
+
+# Speculative retrieval while the LLM router decides
+SPECULATIVE_RETRIEVAL = os.getenv("SPECULATIVE_RETRIEVAL", "true").lower() == "true"
+SPECULATIVE_EXPANSION = os.getenv("SPECULATIVE_EXPANSION", "false").lower() == "true"
+
+# Document extraction guards
+MAX_RESUME_PAGES = int(os.getenv("MAX_RESUME_PAGES", "200"))
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_MB", "20")) * 1024 * 1024
+PARALLEL_PDF_MIN_PAGES = int(os.getenv("PARALLEL_PDF_MIN_PAGES", "32"))
+PDF_PAGES_PER_WORKER = int(os.getenv("PDF_PAGES_PER_WORKER", "16"))
+
+# Bulk ingestion
+BULK_EXTRACT_WORKERS = int(os.getenv("BULK_EXTRACT_WORKERS", str(min(8, os.cpu_count() or 1))))
+BULK_LLM_CONCURRENCY = int(os.getenv("BULK_LLM_CONCURRENCY", "8"))
+BULK_EMBED_BATCH_SIZE = int(os.getenv("BULK_EMBED_BATCH_SIZE", "256"))
+
+# Candidate ranking: embedding prefilter over the whole pool, LLM fit scoring on the shortlist
+RANK_PREFILTER_K = int(os.getenv("RANK_PREFILTER_K", "100"))
+RANK_TOP_N = int(os.getenv("RANK_TOP_N", "20"))
+RANK_LLM_CONCURRENCY = int(os.getenv("RANK_LLM_CONCURRENCY", "8"))
+
+# Exact-match LLM response cache (per prompt runnable)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_responses.sqlite"))
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "128"))
+LLM_CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+# Comma-separated runnable names to leave uncached, e.g. "web_search,llm_fallback"
+LLM_CACHE_DISABLED = {n.strip() for n in os.getenv("LLM_CACHE_DISABLED", "").split(",") if n.strip()}
+
+# Hybrid (BM25 + vector) retrieval
+HYBRID_RETRIEVAL = os.getenv("HYBRID_RETRIEVAL", "true").lower() == "true"
+LEXICAL_FAST_PATH = os.getenv("LEXICAL_FAST_PATH", "true").lower() == "true"
+LEXICAL_MIN_IDF = float(os.getenv("LEXICAL_MIN_IDF", "1.0"))
+LEXICAL_MAX_TERMS = int(os.getenv("LEXICAL_MAX_TERMS", "4"))
@@ -1,22 +1,14 @@
 import gradio as gr
 from services.chat_service import chat_stream
-from services.resume_service import process_resume_file, process_job_desc
-from services.skills_service import render_skill_chips
+from services.resume_service import release_session
+from services.ingestion_service import process_resume_job
+from services.skills_service import resume_suggestions, format_suggestions
 from app.config import LANGCHAIN_PROJECT
 from langsmith import Client
 
 client = Client()
 print(f"✅ LangSmith connected. Project: {LANGCHAIN_PROJECT}")
 
-# --- Workflow functions ---
-def process_resume_job(resume_file, job_desc_text):
-    status, app_state, metadata_state, jd_state = process_resume_file(resume_file, job_desc_text)
-    if job_desc_text.strip():
-        status, app_state, metadata_state, jd_state = process_job_desc(job_desc_text, app_state, metadata_state)
-
-    fit_summary, skills_html, ats_recs = render_skill_chips(app_state, metadata_state, jd_state)
-    return status, app_state, metadata_state, jd_state, fit_summary, skills_html, ats_recs
-
 # --- Theme & CSS ---
 custom_theme = gr.themes.Base(
     primary_hue="violet",
@@ -63,7 +55,7 @@ input[type="file"], textarea, input, .gr-button {
 with gr.Blocks(theme=custom_theme, css=css, title="Adaptive RAG Resume Agent") as demo:
 
     # States
-    app_state = gr.State(None)
+    app_state = gr.State(None, delete_callback=release_session)
     metadata_state = gr.State(None)
     jd_state = gr.State("")
 
@@ -109,10 +101,12 @@ with gr.Blocks(theme=custom_theme, css=css, title="Adaptive RAG Resume Agent") a
             with gr.Column(scale=1, visible=False) as ats_section:
                 gr.Markdown("### ATS Recommendations & Update Inputs")
                 ats_output_display = gr.JSON(label="ATS Recommendations")          
+                suggest_btn = gr.Button("✨ Suggest Resume Improvements")
+                suggestions_display = gr.Markdown()
 
     # --- Process Action ---
-    def process_action(resume_file, job_desc_text):
-        status_text, app_s, meta_s, jd_s, fit_summary, skills_html, ats_recs = process_resume_job(resume_file, job_desc_text)
+    def process_action(resume_file, job_desc_text, app_s):
+        status_text, app_s, meta_s, jd_s, fit_summary, skills_html, ats_recs = process_resume_job(resume_file, job_desc_text, app_s)
         show_sections = bool(job_desc_text.strip())
 
         return (
@@ -126,7 +120,7 @@ with gr.Blocks(theme=custom_theme, css=css, title="Adaptive RAG Resume Agent") a
 
     process_btn.click(
         process_action,
-        inputs=[resume_file, job_desc],
+        inputs=[resume_file, job_desc, app_state],
         outputs=[
             upload_section, results_section, skills_section, ats_section, 
             status, app_state, metadata_state, jd_state,
@@ -136,7 +130,8 @@ with gr.Blocks(theme=custom_theme, css=css, title="Adaptive RAG Resume Agent") a
 
 
     # --- Update Action ---
-    def update_action():
+    def update_action(app_s):
+        release_session(app_s)
         return (
             gr.update(visible=True),     # Show upload section
             gr.update(visible=False),    # Hide results section
@@ -145,21 +140,32 @@ with gr.Blocks(theme=custom_theme, css=css, title="Adaptive RAG Resume Agent") a
             gr.update(value=[]),         # Clear chatbot
             gr.update(value=""),         # Clear fit summary
             gr.update(value=""),         # Clear skills HTML
-            gr.update(value={})          # Clear ATS JSON
+            gr.update(value={}),         # Clear ATS JSON
+            gr.update(value="")          # Clear suggestions
         )
 
 
     update_btn.click(
         update_action,
-        inputs=[],
+        inputs=[app_state],
         outputs=[
             upload_section, results_section, status,
             app_state, metadata_state, jd_state,
             chatbot_display, fit_summary_display,
-            skills_html_display, ats_output_display
+            skills_html_display, ats_output_display, suggestions_display
         ]
     )
 
+    # --- Suggestions (on demand; usually already prefetched in the background) ---
+    def suggest_action(app_s, jd_s):
+        try:
+            return format_suggestions(resume_suggestions(app_s, jd_s))
+        except Exception as e:
+            print(f"Resume suggestions failed: {e}")
+            return "⚠️ Unable to generate suggestions at this time."
+
+    suggest_btn.click(suggest_action, inputs=[app_state, jd_state], outputs=[suggestions_display])
+
     # --- Chatbot ---
     user_input.submit(
         chat_stream,
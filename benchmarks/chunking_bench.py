@@ -0,0 +1,104 @@
+# chunking_bench.py
+"""
+Compare automaton-based chunking with the previous per-section regex alternations,
+on synthetic resumes with a growing number of projects.
+
+    python -m benchmarks.chunking_bench --projects 20 100 400
+"""
+import argparse
+import random
+import re
+import time
+from langchain.schema import Document
+from core.resume_chunking import chunk_resume
+
+
+def legacy_chunk_resume(resume_text: str, metadata: dict):
+    """chunk_resume before core.section_matcher."""
+    docs = [Document(page_content=resume_text.strip(), metadata={**metadata, "section": "full", "type": "full_resume"})]
+    sections_raw = metadata.get("section_headers", "")
+    section_headers = [s.strip().upper() for s in sections_raw.split(",") if s.strip()]
+    header_pattern = r'^\s*(' + '|'.join([re.escape(h) for h in section_headers]) + r')\s*:?\s*$'
+    matches = list(re.finditer(header_pattern, resume_text, flags=re.MULTILINE | re.IGNORECASE))
+    for i, match in enumerate(matches):
+        start_idx = match.end()
+        end_idx = matches[i+1].start() if i+1 < len(matches) else len(resume_text)
+        section_name = match.group(1).lower()
+        section_content = resume_text[start_idx:end_idx].strip()
+        if section_content:
+            docs.extend(_legacy_chunk_section(section_content, section_name, metadata))
+    return docs
+
+
+def _legacy_chunk_section(section_text, section_name, metadata):
+    docs = [Document(page_content=section_text.strip(), metadata={"section": section_name, "type": "section"})]
+    items_key = {"projects": "projects", "experience": "experience",
+                 "professional experience": "experience", "education": "education"}.get(section_name)
+    if items_key and metadata.get(items_key):
+        entries = [e.strip() for e in metadata[items_key].split(",") if e.strip()]
+        entries = sorted(entries, key=len, reverse=True)
+        entry_pattern = r'(' + '|'.join(re.escape(e) for e in entries) + r')'
+        matches = list(re.finditer(entry_pattern, section_text, flags=re.IGNORECASE))
+        for i, match in enumerate(matches):
+            end = matches[i+1].start() if i+1 < len(matches) else len(section_text)
+            docs.append(Document(page_content=section_text[match.start():end].strip(),
+                                 metadata={"section": section_name, "type": "item"}))
+    return docs
+
+
+WORDS = ("built scalable services with python kubernetes aws improved latency by reducing "
+         "costs designed api microservices data pipeline dashboards").split()
+
+
+def synthetic_resume(rng: random.Random, n_projects: int):
+    def sentence():
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))) + "."
+
+    projects = [f"Project {rng.choice(['Atlas', 'Nova', 'Orion', 'Vega'])} {i}" for i in range(n_projects)]
+    roles = [f"Engineer at Company {i}" for i in range(max(3, n_projects // 10))]
+    lines = ["SUMMARY", sentence(), "EXPERIENCE"]
+    for role in roles:
+        lines += [role, sentence(), sentence()]
+    lines.append("PROJECTS")
+    for project in projects:
+        lines += [project, sentence(), sentence()]
+    lines += ["EDUCATION", "BSc Computer Science", "SKILLS", "Python, SQL, AWS"]
+    metadata = {
+        "section_headers": "Summary, Experience, Projects, Education, Skills",
+        "projects": ", ".join(projects),
+        "experience": ", ".join(roles),
+        "education": "BSc Computer Science",
+    }
+    return "\n".join(lines), metadata
+
+
+def bench(func, cases, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        re.purge()  # each resume has its own header/entry lists, so patterns are never reused
+        start = time.perf_counter()
+        for text, metadata in cases:
+            func(text, metadata)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, nargs="+", default=[20, 100, 400])
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for n_projects in args.projects:
+        cases = [synthetic_resume(rng, n_projects) for _ in range(args.resumes)]
+        def key(docs):
+            return [(d.metadata["section"], d.metadata["type"], d.page_content) for d in docs]
+
+        same = all(key(legacy_chunk_resume(t, m)) == key(chunk_resume(t, m)) for t, m in cases)
+        legacy = bench(legacy_chunk_resume, cases, args.repeat)
+        automaton = bench(chunk_resume, cases, args.repeat)
+        print(f"{n_projects:>4} projects: regex {legacy * 1000 / args.resumes:7.2f} ms/resume | "
+              f"automaton {automaton * 1000 / args.resumes:7.2f} ms/resume | "
+              f"{legacy / automaton:5.2f}x | same chunks: {same}")
@@ -0,0 +1,76 @@
+# redaction_bench.py
+"""
+Compare the single-pass redaction engine with the previous five-pass anonymize_resume.
+
+    python -m benchmarks.redaction_bench --resumes 200 --repeat 5
+"""
+import argparse
+import random
+import re
+import time
+from core.redaction import redact
+
+
+def legacy_anonymize_resume(text: str) -> str:
+    """anonymize_resume before core.redaction: one re.sub pass per detector."""
+    text = re.sub(
+        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+        'EMAIL_REDACTED', text
+    )
+    text = re.sub(
+        r'(\+?\d{1,3}[\s.-]?)?(\(?\d{3}\)?[\s.-]?)\d{3}\s*[\-.\s]\s*\d{4}',
+        'PHONE_REDACTED', text
+    )
+    text = re.sub(r'https?://\S+', 'URL_REDACTED', text)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'\n+', '\n', text)
+    return text
+
+
+WORDS = ("python developer led team built scalable services kubernetes aws data pipeline "
+         "machine learning improved latency reduced costs designed api microservices").split()
+
+
+def synthetic_resume(rng: random.Random, lines: int = 400) -> str:
+    out = []
+    for i in range(lines):
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 15)))
+        roll = rng.random()
+        if roll < 0.05:
+            words += f"  contact: user{i}@example{i % 7}.com"
+        elif roll < 0.10:
+            words += f" phone +1 ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
+        elif roll < 0.15:
+            words += f" https://github.com/user{i}/project-{rng.randint(1, 99)}"
+        out.append(words + ("\n\n" if roll > 0.8 else "\n"))
+    return "".join(out)
+
+
+def bench(func, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=400, help="Lines per synthetic resume")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [synthetic_resume(rng, args.lines) for _ in range(args.resumes)]
+    mb = sum(len(t) for t in texts) / 1e6
+
+    mismatches = sum(legacy_anonymize_resume(t) != redact(t).text for t in texts)
+    legacy = bench(legacy_anonymize_resume, texts, args.repeat)
+    single = bench(lambda t: redact(t), texts, args.repeat)
+
+    print(f"{args.resumes} resumes, {mb:.1f} MB, outputs differing: {mismatches}")
+    print(f"legacy (5 passes): {legacy:.3f}s  {mb / legacy:.1f} MB/s")
+    print(f"single pass:       {single:.3f}s  {mb / single:.1f} MB/s  ({legacy / single:.2f}x)")
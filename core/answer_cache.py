@@ -0,0 +1,100 @@
+# answer_cache.py
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+from core.cache_store import CacheStats
+
+
+def cache_namespace(resume_key: str, job_description: str) -> tuple:
+    """Answers are only reusable for the same resume and the same job description."""
+    jd_key = hashlib.sha256((job_description or "").strip().encode("utf-8")).hexdigest()[:16]
+    return (resume_key or "", jd_key)
+
+
+# Words that make a question depend on earlier turns ("and the second one?", "why is that?")
+_REFERS_BACK = re.compile(
+    r"\b(it|its|that|this|these|those|they|them|their|he|she|his|her|above|previous|previously|"
+    r"earlier|before|former|latter|same|also|more|else|other|another|again|first one|second one|last one)\b"
+    r"|^\s*(and|but|so|or|what about|how about|why)\b",
+    re.IGNORECASE,
+)
+
+
+def refers_back(question: str) -> bool:
+    """True if the question likely depends on the conversation, so a cached answer from another chat won't fit."""
+    return bool(_REFERS_BACK.search(question or ""))
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class SemanticAnswerCache:
+    """
+    In-memory semantic cache of final answers.
+    A question hits when its embedding has cosine similarity >= threshold with a cached
+    question in the same (resume, JD) namespace. Entries expire after ttl_seconds and the
+    least recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, threshold: float = 0.95, ttl_seconds: float = 3600, max_entries: int = 1000):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries = OrderedDict()  # entry_id -> {"namespace", "question", "embedding", "answer", "created"}
+        self._by_namespace = {}        # namespace -> set of entry_ids
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, namespace: tuple, question_embedding: List[float]) -> Optional[str]:
+        query = _normalize(question_embedding)
+        now = time.time()
+        best_id, best_score = None, self.threshold
+        with self._lock:
+            for entry_id in list(self._by_namespace.get(namespace, ())):
+                entry = self._entries[entry_id]
+                if now - entry["created"] > self.ttl_seconds:
+                    self._remove(entry_id)
+                    continue
+                score = sum(a * b for a, b in zip(query, entry["embedding"]))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+
+            if best_id is None:
+                self.stats.record(misses=1)
+                return None
+            self._entries.move_to_end(best_id)
+            self.stats.record(hits=1)
+            return self._entries[best_id]["answer"]
+
+    def store(self, namespace: tuple, question: str, question_embedding: List[float], answer: str):
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {
+                "namespace": namespace,
+                "question": question,
+                "embedding": _normalize(question_embedding),
+                "answer": answer,
+                "created": time.time(),
+            }
+            self._by_namespace.setdefault(namespace, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id)
+        ids = self._by_namespace.get(entry["namespace"])
+        if ids is not None:
+            ids.discard(entry_id)
+            if not ids:
+                del self._by_namespace[entry["namespace"]]
+
+    def __len__(self):
+        return len(self._entries)
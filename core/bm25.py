@@ -0,0 +1,78 @@
+# bm25.py
+import math
+import re
+from collections import Counter, defaultdict
+from typing import List, Tuple
+from langchain.schema import Document
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+# Function words and question phrasing that say nothing about resume content
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have he her his how i if in
+into is it its me my of on or our she so than that the their them they this to was we were what when
+where which who whom why will with would you your know knows tell describe explain list show give any
+candidate candidates resume cv person applicant much many about
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased terms; keeps tokens like c++, c#, node.js and k8s intact."""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed set of documents, with an inverted index so a query
+    only touches the postings of its own terms.
+    """
+
+    def __init__(self, documents: List[Document], k1: float = 1.5, b: float = 0.75):
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)   # term -> [(doc index, term frequency)]
+        self.doc_lengths = []
+        self.terms = []                      # doc index -> set of terms
+        for i, doc in enumerate(self.documents):
+            counts = Counter(tokenize(doc.page_content))
+            self.doc_lengths.append(sum(counts.values()))
+            self.terms.append(set(counts))
+            for term, tf in counts.items():
+                self.postings[term].append((i, tf))
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+
+    def __len__(self):
+        return len(self.documents)
+
+    def idf(self, term: str) -> float:
+        n = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.documents) - n + 0.5) / (n + 0.5))
+
+    def search(self, query: str, k: int = 6) -> List[Tuple[Document, float]]:
+        """Top-k (document, score) pairs; documents without any query term are not returned."""
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for i, tf in postings:
+                norm = 1 - self.b + self.b * self.doc_lengths[i] / (self.avg_length or 1)
+                scores[i] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
+        return [(self.documents[i], score) for i, score in ranked]
+
+    def is_strong_match(self, query: str, min_idf: float = 1.0, max_terms: int = 4) -> bool:
+        """
+        True when the query is a short keyword lookup that the index answers on its own:
+        every query term is discriminative (idf >= min_idf) and a single chunk other than
+        the full resume contains all of them.
+        """
+        terms = set(tokenize(query))
+        if not terms or len(terms) > max_terms:
+            return False
+        if any(term not in self.postings or self.idf(term) < min_idf for term in terms):
+            return False
+        candidates = set.intersection(*({i for i, _ in self.postings[t]} for t in terms))
+        return any(self.documents[i].metadata.get("type") != "full_resume" for i in candidates)
@@ -0,0 +1,245 @@
+# cache_store.py
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheStats:
+    """Hit/miss counters shared by the cache layers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hits: int = 0, misses: int = 0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 4)}
+
+    def __repr__(self):
+        return f"CacheStats(hits={self.hits}, misses={self.misses}, hit_rate={self.hit_rate:.2%})"
+
+
+class TTLCache:
+    """
+    In-memory key -> value cache for results that are cheap to keep but expensive to recompute.
+    Entries expire ttl_seconds after they were stored; beyond max_entries the least
+    recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries = OrderedDict()  # key -> (created, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and time.time() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            self.stats.record(hits=entry is not None, misses=entry is None)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def setdefault(self, key, factory):
+        """
+        Return the cached value, or store and return factory() atomically. factory runs under
+        the cache lock, so it should be cheap (e.g. submit work and return its Future).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl_seconds is None or time.time() - entry[0] <= self.ttl_seconds):
+                self._entries.move_to_end(key)
+                self.stats.record(hits=1)
+                return entry[1]
+            self.stats.record(misses=1)
+            value = factory()
+            self._entries[key] = (time.time(), value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheStore:
+    """
+    Persistent key -> bytes store backed by a single SQLite table.
+    Entries are evicted least-recently-used first once the stored payload exceeds max_bytes,
+    and expire ttl_seconds after they were written (if set). Access times from reads are
+    buffered and written in batches (or before an eviction), so a hit costs no write.
+    """
+
+    touch_batch = 256   # buffered access times written together
+
+    def __init__(self, path: str, table: str = "cache", max_bytes: int = None, ttl_seconds: float = None):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.table = table
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._touched = {}  # key -> last access time not yet written
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL, created REAL NOT NULL)"
+        )
+        columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+        if "created" not in columns:
+            # Tables written before TTL support
+            self._conn.execute(f"ALTER TABLE {table} ADD COLUMN created REAL NOT NULL DEFAULT 0")
+            self._conn.execute(f"UPDATE {table} SET created = last_access")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_access ON {table}(last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+
+    def get(self, key: str):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys) -> dict:
+        """Return {key: value} for the unexpired keys present and mark them as recently used."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        if not keys:
+            return found
+        now = time.time()
+        expired = []
+        with self._lock:
+            # SQLite caps the number of bound parameters per statement
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value, created FROM {self.table} WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, value, created in rows:
+                    if self.ttl_seconds is not None and created < now - self.ttl_seconds:
+                        expired.append((key, len(value)))
+                    else:
+                        found[key] = value
+            if expired:
+                self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", [(k,) for k, _ in expired])
+                self._total_bytes -= sum(size for _, size in expired)
+                self._conn.commit()
+            for key in found:
+                self._touched[key] = now
+            if len(self._touched) >= self.touch_batch:
+                self._write_touches()
+                self._conn.commit()
+        return found
+
+    def put(self, key: str, value: bytes):
+        self.put_many({key: value})
+
+    def put_many(self, items: dict):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, value in items.items():
+                row = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._total_bytes -= row[0]
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, size, last_access, created) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now, now),
+                )
+                self._total_bytes += len(value)
+                self._touched.pop(key, None)
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            row = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            self._touched.pop(key, None)
+            if row:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._total_bytes -= row[0]
+                self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            self._total_bytes = 0
+            self._touched.clear()
+
+    def purge_expired(self) -> int:
+        """Delete all expired rows; returns how many were removed."""
+        if self.ttl_seconds is None:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            freed, count = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0), COUNT(*) FROM {self.table} WHERE created < ?", (cutoff,)
+            ).fetchone()
+            self._conn.execute(f"DELETE FROM {self.table} WHERE created < ?", (cutoff,))
+            self._conn.commit()
+            self._total_bytes -= freed
+        return count
+
+    def _write_touches(self):
+        """Write buffered access times (caller holds the lock and commits)."""
+        if self._touched:
+            self._conn.executemany(
+                f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                [(t, k) for k, t in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        """Drop least-recently-used rows until the payload fits in max_bytes (caller holds the lock)."""
+        if not self.max_bytes or self._total_bytes <= self.max_bytes:
+            return
+        self._write_touches()
+        victims = []
+        freed = 0
+        excess = self._total_bytes - self.max_bytes
+        for key, size in self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY last_access"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", victims)
+        self._total_bytes -= freed
+
+    @property
+    def size_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
@@ -0,0 +1,133 @@
+# chat_history.py
+import asyncio
+import threading
+from typing import List, Tuple
+from app.config import HISTORY_TOKEN_BUDGET, HISTORY_SUMMARY_BATCH_TOKENS
+from core.prompts import summarize_history_runnable
+from core.token_counting import count_tokens
+
+
+def format_history(messages, summary: str = "") -> str:
+    """Conversation text for prompts: the rolling summary of older turns, then recent messages verbatim."""
+    lines = [f"Summary of earlier conversation: {summary}"] if summary else []
+    for msg in messages:
+        role = "User" if msg["role"] == "user" else "Assistant"
+        lines.append(f"{role}: {msg['content']}")
+    return "\n".join(lines)
+
+
+class ChatMemory:
+    """
+    Per-session chat history with a bounded prompt footprint.
+    The most recent messages are kept verbatim up to token_budget tokens; older messages
+    are folded, a batch of summary_batch_tokens at a time, into a rolling summary by
+    compact(). Until then they stay verbatim, so prompts never exceed
+    token_budget + summary_batch_tokens of history. Token counts are computed once per message.
+    """
+
+    def __init__(self, token_budget: int = HISTORY_TOKEN_BUDGET, summary_batch_tokens: int = HISTORY_SUMMARY_BATCH_TOKENS):
+        self.token_budget = token_budget
+        self.summary_batch_tokens = summary_batch_tokens
+        self.messages: List[dict] = []
+        self.token_counts: List[int] = []
+        self.summary = ""
+        self.summarized = 0    # messages[:summarized] are covered by the summary
+        self._lock = threading.Lock()
+        self._compaction = None  # running background acompact() task
+
+    def add(self, role: str, content: str):
+        with self._lock:
+            self.messages.append({"role": role, "content": content})
+            self.token_counts.append(count_tokens(content) + 4)   # + role/formatting overhead
+
+    def add_turn(self, question: str, answer: str):
+        """Record a question together with its answer, so an aborted request leaves no trace."""
+        self.add("user", question)
+        self.add("assistant", answer)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def _window_start(self, budget: int) -> int:
+        """Index of the oldest unsummarized message that still fits budget (always keeps the last one)."""
+        used, start = 0, len(self.messages)
+        while start > self.summarized:
+            cost = self.token_counts[start - 1]
+            if used + cost > budget and start < len(self.messages):
+                break
+            used += cost
+            start -= 1
+        return start
+
+    def window(self) -> Tuple[str, List[dict]]:
+        """(summary, recent messages) to put into prompts."""
+        with self._lock:
+            start = self._window_start(self.token_budget + self.summary_batch_tokens)
+            return self.summary, list(self.messages[start:])
+
+    def prompt_text(self) -> str:
+        summary, recent = self.window()
+        return format_history(recent, summary)
+
+    def _pending(self):
+        """Messages outside the window and not yet summarized, if there are enough to be worth a call."""
+        with self._lock:
+            start = self._window_start(self.token_budget)
+            if sum(self.token_counts[self.summarized:start]) < self.summary_batch_tokens:
+                return None
+            return start, self.summary, self.messages[self.summarized:start]
+
+    def _apply(self, start, summary):
+        with self._lock:
+            self.summary = summary
+            self.summarized = max(self.summarized, start)
+
+    @staticmethod
+    def _summary_inputs(previous, messages):
+        return {"summary": previous or "(none)", "new_lines": format_history(messages)}
+
+    def compact(self) -> bool:
+        """Fold messages that left the window into the summary. Returns True if the summary changed."""
+        pending = self._pending()
+        if not pending:
+            return False
+        start, previous, messages = pending
+        try:
+            response = summarize_history_runnable.invoke(self._summary_inputs(previous, messages))
+        except Exception as e:
+            print(f"History summarization failed, keeping the previous summary: {e}")
+            return False
+        self._apply(start, getattr(response, "content", str(response)).strip())
+        return True
+
+    async def acompact(self) -> bool:
+        """Async version of compact."""
+        pending = self._pending()
+        if not pending:
+            return False
+        start, previous, messages = pending
+        try:
+            response = await summarize_history_runnable.ainvoke(self._summary_inputs(previous, messages))
+        except Exception as e:
+            print(f"History summarization failed, keeping the previous summary: {e}")
+            return False
+        self._apply(start, getattr(response, "content", str(response)).strip())
+        return True
+
+    def compact_in_background(self):
+        """
+        Run acompact() as a task on the running loop, so it neither delays the caller nor
+        depends on it finishing. Skipped while a previous compaction is still running;
+        the next call picks up whatever it left.
+        """
+        if self._compaction is not None and not self._compaction.done():
+            return
+        self._compaction = asyncio.get_running_loop().create_task(self.acompact())
+
+
+def session_memory(app_state: dict) -> ChatMemory:
+    """The session's ChatMemory, created on first use."""
+    memory = app_state.get("chat_memory")
+    if memory is None:
+        memory = app_state["chat_memory"] = ChatMemory()
+    return memory
@@ -0,0 +1,88 @@
+# context_packing.py
+from typing import List
+from langchain.schema import Document
+from app.config import CONTEXT_TOKEN_BUDGET, CONTEXT_MMR_LAMBDA
+from core.bm25 import tokenize
+from core.token_counting import count_tokens
+
+
+def _span(doc: Document):
+    """(resume key, start, end) of a chunk; the full resume spans everything, None if unknown."""
+    meta = doc.metadata or {}
+    key = meta.get("resume_hash", "")
+    if meta.get("type") == "full_resume":
+        return key, 0, float("inf")
+    if "start" in meta and "end" in meta:
+        return key, meta["start"], meta["end"]
+    return None
+
+
+def contains(parent: Document, child: Document) -> bool:
+    """True if child's text is part of parent (full resume > section > item, or plain text containment)."""
+    p, c = _span(parent), _span(child)
+    if p is not None and c is not None:
+        return p[0] == c[0] and p[1] <= c[1] and c[2] <= p[2]
+    return child.page_content.strip() in parent.page_content
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _truncate(text: str, tokens: int, budget: int) -> str:
+    return text[:max(0, int(len(text) * budget / tokens))].rstrip()
+
+
+def pack_context(documents: List[Document], token_budget: int = CONTEXT_TOKEN_BUDGET,
+                 mmr_lambda: float = CONTEXT_MMR_LAMBDA) -> List[Document]:
+    """
+    Select documents (ranked best first) for the prompt within token_budget:
+
+    - a chunk already covered by a selected parent is skipped; a parent replaces its
+      selected children when the extra tokens fit, so no text appears twice
+    - among the rest, MMR trades rank against token overlap (Jaccard) with what is selected
+
+    Returns the selection in relevance order.
+    """
+    candidates = list({d.page_content: d for d in reversed(documents)}.values())[::-1]  # first occurrence wins
+    if not candidates:
+        return []
+    n = len(candidates)
+    relevance = [1.0 - i / n for i in range(n)]
+    terms = [set(tokenize(d.page_content)) for d in candidates]
+    costs = [count_tokens(d.page_content) for d in candidates]
+
+    selected, used = [], 0   # selected: candidate indices
+    rank = {}                # selected index -> position used for ordering
+    remaining = list(range(n))
+    while remaining:
+        def mmr(i):
+            overlap = max((_jaccard(terms[i], terms[j]) for j in selected), default=0.0)
+            return mmr_lambda * relevance[i] - (1 - mmr_lambda) * overlap
+        best = max(remaining, key=mmr)
+        remaining.remove(best)
+        doc = candidates[best]
+
+        if any(contains(candidates[j], doc) for j in selected):
+            continue
+        children = [j for j in selected if contains(doc, candidates[j])]
+        extra = costs[best] - sum(costs[j] for j in children)
+        if used + extra > token_budget:
+            continue
+        # A parent takes the rank of its best child
+        rank[best] = min([best] + [rank[j] for j in children])
+        selected = [j for j in selected if j not in children]
+        selected.append(best)
+        used += extra
+
+    if not selected:
+        # Nothing fits whole: keep the top document, cut to the budget
+        top = candidates[0]
+        return [Document(page_content=_truncate(top.page_content, costs[0], token_budget), metadata=top.metadata)]
+    return [candidates[j] for j in sorted(selected, key=rank.get)]
+
+
+def format_context(documents: List[Document]) -> str:
+    return "\n\n".join(d.page_content for d in documents)
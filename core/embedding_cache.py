@@ -0,0 +1,65 @@
+# embedding_cache.py
+import asyncio
+import hashlib
+from array import array
+from typing import List
+from langchain_core.embeddings import Embeddings
+from core.cache_store import CacheStats, SQLiteCacheStore
+
+
+def _encode(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Content-addressed cache in front of an Embeddings object.
+    Vectors are stored as float32 blobs keyed by sha256(model, text), so only unseen text is embedded.
+    """
+
+    def __init__(self, underlying: Embeddings, model_name: str, store: SQLiteCacheStore):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.store = store
+        self.stats = CacheStats()
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, texts: List[str]):
+        keys = [self._key(t) for t in texts]
+        cached = self.store.get_many(keys)
+        # Deduplicate misses so repeated chunks in one batch are embedded once
+        missing = list(dict.fromkeys(t for t, k in zip(texts, keys) if k not in cached))
+        self.stats.record(hits=len(texts) - len(missing), misses=len(missing))
+        return keys, cached, missing
+
+    def _store(self, missing: List[str], vectors: List[List[float]], cached: dict):
+        fresh = {self._key(t): _encode(v) for t, v in zip(missing, vectors)}
+        self.store.put_many(fresh)
+        cached.update(fresh)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._lookup(texts)
+        if missing:
+            self._store(missing, self.underlying.embed_documents(missing), cached)
+        return [_decode(cached[k]) for k in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # sqlite reads and writes block, so they run on a worker thread instead of the event loop
+        keys, cached, missing = await asyncio.to_thread(self._lookup, texts)
+        if missing:
+            await asyncio.to_thread(self._store, missing, await self.underlying.aembed_documents(missing), cached)
+        return [_decode(cached[k]) for k in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
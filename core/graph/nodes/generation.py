@@ -1,30 +1,33 @@
 from core.prompts import rag_runnable, llm_fallback_runnable
+from core.llm_cache import LLM_CACHE_REFRESH
+from core.chat_history import format_history
+from core.context_packing import pack_context, format_context
 
-def format_history_for_prompt(history):
-    """Format structured chat history into text for the prompt."""
-    formatted = ""
-    for msg in history:
-        role = "User" if msg["role"] == "user" else "Assistant"
-        formatted += f"{role}: {msg['content']}\n"
-    return formatted.strip()
+def format_history_for_prompt(history, summary=""):
+    """Format structured chat history (and the summary of older turns) into text for the prompt."""
+    return format_history(history, summary)
 
 
-def generate(state, rag_chain=None):
-    """Main generation node for RAG-based responses (no app_state)."""
+def _generation_inputs(state):
+    """
+    Build RAG prompt inputs and the packed context documents,
+    or return an early result dict when there is nothing to answer.
+    """
     query = state.get("question", "").strip()
     jd = state.get("job_description", "")
     jd_text = getattr(jd, "content", jd).strip() if jd else ""
 
     if not query:
-        return {"generation": "⚠️ No query provided.", "documents": []}
+        return None, None, {"generation": "⚠️ No query provided.", "documents": []}
 
     context_docs = state.get("documents", [])
     if not context_docs:
-        return {"generation": "⚠️ No context documents available.", "documents": []}
+        return None, None, {"generation": "⚠️ No context documents available.", "documents": []}
 
-    context_text = "\n\n".join([d.page_content for d in context_docs])
-    chat_history = state.get("chat_history", [])
-    conversation_text = format_history_for_prompt(chat_history)
+    # Overlapping full/section/item chunks are collapsed and the rest fit to a token budget
+    context_docs = pack_context(context_docs)
+    context_text = format_context(context_docs)
+    conversation_text = format_history_for_prompt(state.get("chat_history", []), state.get("history_summary", ""))
 
     prompt_inputs = {
         "context": context_text,
@@ -32,18 +35,55 @@ def generate(state, rag_chain=None):
         "question": query,
         "conversation_history": conversation_text,
     }
+    return prompt_inputs, context_docs, None
+
+
+def _generation_config(state):
+    # A regeneration (after an unsupported answer) must not get the cached answer back
+    if state.get("attempts", 0):
+        return {"configurable": {LLM_CACHE_REFRESH: True}}
+    return None
+
+
+def generate(state):
+    """Main generation node for RAG-based responses (no app_state)."""
+    prompt_inputs, context_docs, early = _generation_inputs(state)
+    if early:
+        return early
 
     try:
-        response = rag_runnable.invoke(prompt_inputs)
+        response = rag_runnable.invoke(prompt_inputs, _generation_config(state))
         final_answer = getattr(response, "content", str(response)).strip()
     except Exception as e:
         print(f"RAG generation failed: {e}")
         final_answer = "⚠️ Unable to generate a response at this time."
 
     return {
-        "question": query,
+        "question": prompt_inputs["question"],
+        "generation": final_answer,
+        "documents": context_docs,   # grading sees exactly what the answer was based on
+        "attempts": state.get("attempts", 0) + 1,
+    }
+
+
+async def agenerate(state):
+    """Async version of generate."""
+    prompt_inputs, context_docs, early = _generation_inputs(state)
+    if early:
+        return early
+
+    try:
+        response = await rag_runnable.ainvoke(prompt_inputs, _generation_config(state))
+        final_answer = getattr(response, "content", str(response)).strip()
+    except Exception as e:
+        print(f"RAG generation failed: {e}")
+        final_answer = "⚠️ Unable to generate a response at this time."
+
+    return {
+        "question": prompt_inputs["question"],
         "generation": final_answer,
-        "documents": context_docs,
+        "documents": context_docs,   # grading sees exactly what the answer was based on
+        "attempts": state.get("attempts", 0) + 1,
     }
 
 
@@ -53,8 +93,7 @@ def llm_fallback(state):
     if not question:
         return {"generation": "⚠️ No question provided."}
 
-    chat_history = state.get("chat_history", [])
-    conversation_text = format_history_for_prompt(chat_history)
+    conversation_text = format_history_for_prompt(state.get("chat_history", []), state.get("history_summary", ""))
 
     try:
         prompt_inputs = {"question": question, "conversation_history": conversation_text}
@@ -65,3 +104,22 @@ def llm_fallback(state):
         final_answer = "⚠️ Unable to generate a response at this time."
 
     return {"question": question, "generation": final_answer}
+
+
+async def allm_fallback(state):
+    """Async version of llm_fallback."""
+    question = state.get("question", "").strip()
+    if not question:
+        return {"generation": "⚠️ No question provided."}
+
+    conversation_text = format_history_for_prompt(state.get("chat_history", []), state.get("history_summary", ""))
+
+    try:
+        prompt_inputs = {"question": question, "conversation_history": conversation_text}
+        generation = await llm_fallback_runnable.ainvoke(prompt_inputs)
+        final_answer = getattr(generation, "content", str(generation)).strip()
+    except Exception as e:
+        print(f"LLM fallback failed: {e}")
+        final_answer = "⚠️ Unable to generate a response at this time."
+
+    return {"question": question, "generation": final_answer}
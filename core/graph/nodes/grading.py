@@ -1,27 +1,29 @@
+from collections import Counter
 from core.prompts import grade_generation_runnable
 from core.graph.types import GradeAnswer
 from langchain.output_parsers import PydanticOutputParser
+from core.context_packing import pack_context, format_context
 
 # Parser from BaseModel
 parser = PydanticOutputParser(pydantic_object=GradeAnswer)
 
-def grade_generation(state):
-    """
-    Grade AI answer based on context and question.
-    Returns one of: "useful", "not useful", "not supported"
-    """
-    question = state["question"]
-    generation = state["generation"]
-    context = "\n".join([d.page_content for d in state.get("documents", [])])  # optional
+# How often each grading path triggers (grades, retries, limits, fallbacks)
+grading_counters = Counter()
 
-    # Invoke RunnableSequence
-    output = grade_generation_runnable.invoke({
-        "question": question,
-        "generation": generation,
+# Higher is better; used to keep the best answer seen so far
+GRADE_RANK = {"useful": 2, "not supported": 1, "not useful": 0}
+
+def _grading_inputs(state):
+    # generate() already packed the documents; packing is idempotent and keeps other callers in budget
+    context = format_context(pack_context(state.get("documents", [])))
+    return {
+        "question": state["question"],
+        "generation": state["generation"],
         "context": context,
         "format_instructions": parser.get_format_instructions()
-    })
+    }
 
+def _grade_to_route(output):
     # Parse into GradeAnswer
     graded = parser.parse(getattr(output, "content", str(output)))
 
@@ -32,3 +34,72 @@ def grade_generation(state):
         return "not supported"
     else:
         return "not useful"
+
+def grade_generation(state):
+    """
+    Grade AI answer based on context and question.
+    Returns one of: "useful", "not useful", "not supported"
+    """
+    # Invoke RunnableSequence
+    output = grade_generation_runnable.invoke(_grading_inputs(state))
+    return _grade_to_route(output)
+
+async def agrade_generation(state):
+    """Async version of grade_generation."""
+    output = await grade_generation_runnable.ainvoke(_grading_inputs(state))
+    return _grade_to_route(output)
+
+
+def grading_stats():
+    """Snapshot of the grading path counters, for monitoring."""
+    return dict(grading_counters)
+
+def _grade_update(state, grade):
+    grading_counters[grade] += 1
+    update = {"grade": grade}
+    if GRADE_RANK.get(grade, -1) > GRADE_RANK.get(state.get("best_grade"), -1):
+        update.update(best_generation=state["generation"], best_grade=grade)
+    return update
+
+def _budget_update(state):
+    grading_counters["budget_exhausted"] += 1
+    update = {"grade": "budget_exhausted"}
+    if not state.get("best_generation"):
+        update["best_generation"] = state.get("generation", "")
+    return update
+
+def grade_node(state, policy):
+    """Grade the latest generation, skipping the grader entirely once the latency budget is spent."""
+    if policy.budget_exhausted(state):
+        return _budget_update(state)
+    return _grade_update(state, grade_generation(state))
+
+async def agrade_node(state, policy):
+    """Async version of grade_node."""
+    if policy.budget_exhausted(state):
+        return _budget_update(state)
+    return _grade_update(state, await agrade_generation(state))
+
+def decide_after_grading(state, policy):
+    """
+    Route on the recorded grade under the policy.
+    Returns one of: "useful", "not useful", "not supported", "give up"
+    """
+    grade = state.get("grade")
+    if grade == "useful":
+        return "useful"
+    if grade == "budget_exhausted" or policy.budget_exhausted(state):
+        return "give up"
+    if grade == "not supported":
+        if policy.can_retry(state):
+            grading_counters["retry"] += 1
+            return "not supported"
+        grading_counters["retry_limit"] += 1
+        return "give up"
+    grading_counters["web_fallback"] += 1
+    return "not useful"
+
+def finalize_generation(state):
+    """Retry limit or latency budget reached: degrade gracefully to the best answer so far."""
+    print(f"⏱️ Returning best answer so far (grade: {state.get('best_grade')}, attempts: {state.get('attempts', 0)})")
+    return {"generation": state.get("best_generation") or state.get("generation", "")}
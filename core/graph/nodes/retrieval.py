@@ -18,7 +18,17 @@
     #     return {"question": question, "documents": list(unique_docs)}
 
 # core/query_expansion.py
+import asyncio
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from core.prompts import expand_query_runnable  # this is your RunnableSequence for query expansion
+from core.rank_fusion import reciprocal_rank_fusion
+from core.vectorstore import lexical_index
+from app.config import HYBRID_RETRIEVAL, LEXICAL_FAST_PATH, LEXICAL_MIN_IDF, LEXICAL_MAX_TERMS
+
+RETRIEVAL_K = 6
+
+# Shared pool for concurrent similarity searches (I/O bound)
+_search_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="retrieval")
 
 def expand_query(user_query: str, num_variations: int = 5):
     """
@@ -26,7 +36,14 @@ def expand_query(user_query: str, num_variations: int = 5):
     """
     # Invoke the RunnableSequence instead of ChatOpenAI directly
     response = expand_query_runnable.invoke({"user_query": user_query, "num_variations": num_variations})
+    return _parse_variations(response)
 
+async def aexpand_query(user_query: str, num_variations: int = 5):
+    """Async version of expand_query."""
+    response = await expand_query_runnable.ainvoke({"user_query": user_query, "num_variations": num_variations})
+    return _parse_variations(response)
+
+def _parse_variations(response):
     text = getattr(response, "content", str(response))
 
     variations = []
@@ -38,34 +55,140 @@ def expand_query(user_query: str, num_variations: int = 5):
 
     return [v for v in variations if v]
 
-def retrieve(state, vector_db):
+def _lexical_lists(vector_db, queries, k):
+    """BM25 rankings for each query from the index kept alongside the collection."""
+    index = lexical_index(vector_db) if HYBRID_RETRIEVAL else None
+    if index is None:
+        return []
+    ranked_lists = [[doc for doc, _ in index.search(q, k=k)] for q in queries]
+    return [ranked for ranked in ranked_lists if ranked]
+
+def lexical_fast_path(question, vector_db):
+    """
+    Documents for a keyword lookup ("do they know Kubernetes?") straight from BM25,
+    or None when the lexical match is not strong enough to skip embedding.
+    """
+    if not (HYBRID_RETRIEVAL and LEXICAL_FAST_PATH):
+        return None
+    index = lexical_index(vector_db)
+    if index is None or not index.is_strong_match(question, min_idf=LEXICAL_MIN_IDF, max_terms=LEXICAL_MAX_TERMS):
+        return None
+    return [doc for doc, _ in index.search(question, k=RETRIEVAL_K)]
+
+def _check_cancelled(cancelled):
+    """Stop a discarded speculative retrieval between its steps (a running thread can't be cancelled)."""
+    if cancelled is not None and cancelled.is_set():
+        raise CancelledError("speculative retrieval discarded")
+
+def _search_all(vector_db, queries, k, question_embedding=None, cancelled=None):
+    """
+    Embed all queries in one batch and run the similarity searches concurrently.
+    queries[0] is the original question; its embedding is reused when routing already computed it.
+    cancelled (threading.Event) stops the work before the embedding call and before the searches.
+    """
+    _check_cancelled(cancelled)
+    embedder = getattr(vector_db, "embeddings", None)
+    if embedder is not None:
+        if question_embedding is not None:
+            query_embeddings = [question_embedding] + (embedder.embed_documents(queries[1:]) if len(queries) > 1 else [])
+        else:
+            query_embeddings = embedder.embed_documents(queries)
+        _check_cancelled(cancelled)
+        return list(_search_pool.map(
+            lambda emb: vector_db.similarity_search_by_vector(emb, k=k), query_embeddings
+        ))
+    return list(_search_pool.map(lambda q: vector_db.similarity_search(q, k=k), queries))
+
+async def _asearch_all(vector_db, queries, k, question_embedding=None):
+    """Async version of _search_all: one batched embedding call, searches gathered concurrently."""
+    embedder = getattr(vector_db, "embeddings", None)
+    if embedder is not None:
+        if question_embedding is not None:
+            query_embeddings = [question_embedding] + (await embedder.aembed_documents(queries[1:]) if len(queries) > 1 else [])
+        else:
+            query_embeddings = await embedder.aembed_documents(queries)
+        return list(await asyncio.gather(*(
+            vector_db.asimilarity_search_by_vector(emb, k=k) for emb in query_embeddings
+        )))
+    return list(await asyncio.gather(*(vector_db.asimilarity_search(q, k=k) for q in queries)))
+
+def retrieve(state, vector_db, cancelled=None):
     """
     Retrieve documents from vector_db based on the user's base query
-    and expanded query perspectives.
+    and expanded query perspectives, merged with BM25 rankings by reciprocal rank fusion.
+    Strong keyword lookups are answered from BM25 alone, without embedding or expansion.
+    Reuses results prefetched speculatively while the router was deciding.
     """
     question = state["question"]
+    prefetched = state.get("prefetched_retrieval")
+    if prefetched and prefetched.get("complete"):
+        return {"question": question, "documents": prefetched["documents"]}
 
-    try:
-        base_retriever = vector_db.as_retriever(search_kwargs={"k": 6})
-    except Exception:
-        base_retriever = None
+    lexical_docs = lexical_fast_path(question, vector_db)
+    if lexical_docs:
+        print("⚡ Lexical fast path")
+        return {"question": question, "documents": lexical_docs}
 
     # Expand query using RunnableSequence
+    _check_cancelled(cancelled)
     expanded_queries = expand_query(question, num_variations=3)
 
-    # Include the original query as well
-    all_queries = [question] + expanded_queries
+    # Include the original query as well (dropping repeated phrasings)
+    all_queries = list(dict.fromkeys([question] + expanded_queries))
 
-    retrieved_docs = []
-
-    if base_retriever:
-        for q in all_queries:
-            retrieved_docs.extend(base_retriever.get_relevant_documents(q))
+    if prefetched:
+        # The original question was already searched; only the expansions remain
+        ranked_lists = prefetched["ranked_lists"] + _search_all(vector_db, all_queries[1:], k=RETRIEVAL_K,
+                                                                cancelled=cancelled)
     else:
-        for q in all_queries:
-            retrieved_docs.extend(vector_db.similarity_search(q, k=3))
+        ranked_lists = _search_all(vector_db, all_queries, k=RETRIEVAL_K,
+                                   question_embedding=state.get("question_embedding"), cancelled=cancelled)
+    return _fused_result(question, ranked_lists + _lexical_lists(vector_db, all_queries, k=RETRIEVAL_K))
+
+async def aretrieve(state, vector_db):
+    """Async version of retrieve."""
+    question = state["question"]
+    prefetched = state.get("prefetched_retrieval")
+    if prefetched and prefetched.get("complete"):
+        return {"question": question, "documents": prefetched["documents"]}
+
+    lexical_docs = lexical_fast_path(question, vector_db)
+    if lexical_docs:
+        print("⚡ Lexical fast path")
+        return {"question": question, "documents": lexical_docs}
 
-    # Deduplicate documents
-    unique_docs = {d.page_content: d for d in retrieved_docs}.values()
+    expanded_queries = await aexpand_query(question, num_variations=3)
+    all_queries = list(dict.fromkeys([question] + expanded_queries))
 
-    return {"question": question, "documents": list(unique_docs)}
+    if prefetched:
+        ranked_lists = prefetched["ranked_lists"] + await _asearch_all(vector_db, all_queries[1:], k=RETRIEVAL_K)
+    else:
+        ranked_lists = await _asearch_all(vector_db, all_queries, k=RETRIEVAL_K,
+                                          question_embedding=state.get("question_embedding"))
+    return _fused_result(question, ranked_lists + _lexical_lists(vector_db, all_queries, k=RETRIEVAL_K))
+
+def prefetch_retrieval(state, vector_db, expand=False, cancelled=None):
+    """
+    Speculative retrieval started before the route is known.
+    With expand=True the full retrieval (including query expansion) runs; otherwise only the
+    original question is searched and retrieve() completes the expansions if the route is taken.
+    Setting cancelled (threading.Event) makes a discarded run stop at its next step.
+    """
+    if expand:
+        return {"complete": True, "documents": retrieve(state, vector_db, cancelled)["documents"]}
+    ranked_lists = _search_all(vector_db, [state["question"]], k=RETRIEVAL_K,
+                               question_embedding=state.get("question_embedding"), cancelled=cancelled)
+    return {"complete": False, "ranked_lists": ranked_lists}
+
+async def aprefetch_retrieval(state, vector_db, expand=False):
+    """Async version of prefetch_retrieval."""
+    if expand:
+        return {"complete": True, "documents": (await aretrieve(state, vector_db))["documents"]}
+    ranked_lists = await _asearch_all(vector_db, [state["question"]], k=RETRIEVAL_K,
+                                      question_embedding=state.get("question_embedding"))
+    return {"complete": False, "ranked_lists": ranked_lists}
+
+def _fused_result(question, ranked_lists):
+    # Fuse rankings instead of flattening, so docs found by several perspectives rank first
+    fused = reciprocal_rank_fusion(ranked_lists)
+    return {"question": question, "documents": [doc for doc, _ in fused]}
@@ -1,44 +1,52 @@
 # core/routing_fn.py
-from core.routing import should_use_vectorstore
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from core.routing import should_use_vectorstore, embed_question, ashould_use_vectorstore, aembed_question
 from core.prompts import routing_runnable
+from core.chat_history import format_history
+from core.graph.nodes.retrieval import prefetch_retrieval, aprefetch_retrieval
+from app.config import ROUTING_SIMILARITY_THRESHOLD, SPECULATIVE_RETRIEVAL, SPECULATIVE_EXPANSION
 
-def format_history_for_routing(history):
-    if not history:
-        return ""
-    formatted = ""
-    for msg in history:
-        role = "User" if msg["role"] == "user" else "Assistant"
-        formatted += f"{role}: {msg['content']}\n"
-    return formatted
+# Speculative retrievals started alongside the LLM router: "used" vs "discarded"
+speculation_counters = Counter()
 
-def route_question(state, vector_db):
-    """
-    Decide how to route a user's question: vectorstore, web search, or LLM fallback.
-    """
-    question = state["question"]
-    q_lower = question.lower()
-    jd_summary = getattr(state.get("job_description", ""), "content", state.get("job_description", ""))
-    jd_summary = jd_summary.lower() if jd_summary else ""
+_speculation_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="speculative-retrieval")
 
-    # Step 1: Quick keyword rule
-    if jd_summary and any(word in q_lower for word in ["company", "role", "position", "salary", "location"]):
-        return "retrieve"
+def format_history_for_routing(history, summary=""):
+    return format_history(history or [], summary)
 
-    # Step 2: Embedding similarity heuristic
-    try:
-        if should_use_vectorstore(question, vector_db, threshold=0.70, k=3):
-            return "retrieve"
-    except Exception:
-        pass
+def select_route(state):
+    """Conditional edge: follow the decision recorded by the route node."""
+    return state["route"]
+
+def _keyword_route(state):
+    """Step 1: quick keyword rule for job-related questions."""
+    q_lower = state["question"].lower()
+    jd_summary = getattr(state.get("job_description", ""), "content", state.get("job_description", ""))
+    jd_summary = jd_summary.lower() if jd_summary else ""
+    return bool(jd_summary and any(word in q_lower for word in ["company", "role", "position", "salary", "location"]))
 
-    # Step 3: LLM-based routing via RunnableSequence
-    route_msg = routing_runnable.invoke({
-        "user_question": question,          
+def _routing_inputs(state):
+    return {
+        "user_question": state["question"],
         "metadata_summary": state.get("metadata_summary", ""),
         "jd_summary": state.get("job_description", ""),
-        "conversation_history": format_history_for_routing(state.get("chat_history", [])),
-    })
+        "conversation_history": format_history_for_routing(state.get("chat_history", []), state.get("history_summary", "")),
+    }
+
+def _decision(state, route, question_embedding=None, prefetched=None):
+    # Routing is the first node, so it also starts the request's latency budget clock
+    decision = {"route": route, "started_at": state.get("started_at") or time.monotonic()}
+    if question_embedding is not None:
+        decision["question_embedding"] = question_embedding
+    if prefetched is not None:
+        decision["prefetched_retrieval"] = prefetched
+    return decision
 
+def _parse_route(route_msg):
     route = route_msg.content.strip().lower()
 
     print("ROUTE:", route)
@@ -49,3 +57,100 @@ def route_question(state, vector_db):
         return "web_search"
     else:
         return "llm_fallback"
+
+def route_question(state, vector_db):
+    """
+    Decide how to route a user's question: vectorstore, web search, or LLM fallback.
+    Records the route and the question embedding so retrieval can reuse it this turn.
+    """
+    question = state["question"]
+
+    # Step 1: Quick keyword rule
+    if _keyword_route(state):
+        return _decision(state, "retrieve")
+
+    # Step 2: Embedding similarity heuristic (embedding is shared with retrieve)
+    question_embedding = state.get("question_embedding")
+    try:
+        if question_embedding is None:
+            question_embedding = embed_question(question, vector_db)
+        if should_use_vectorstore(question, vector_db, threshold=ROUTING_SIMILARITY_THRESHOLD, k=3,
+                                  question_embedding=question_embedding):
+            return _decision(state, "retrieve", question_embedding)
+    except Exception:
+        pass
+
+    # Step 3: LLM-based routing via RunnableSequence.
+    # "vectorstore" is the common answer, so retrieval starts speculatively in parallel.
+    # Future.cancel() can't stop a running thread, so a discarded run also gets a flag it checks between steps
+    speculative, cancelled = None, threading.Event()
+    if SPECULATIVE_RETRIEVAL:
+        speculative = _speculation_pool.submit(
+            prefetch_retrieval, {**state, "question_embedding": question_embedding}, vector_db,
+            SPECULATIVE_EXPANSION, cancelled
+        )
+    try:
+        route_msg = routing_runnable.invoke(_routing_inputs(state))
+    except Exception:
+        if speculative:
+            cancelled.set()
+            speculative.cancel()
+        raise
+    route = _parse_route(route_msg)
+
+    prefetched = None
+    if speculative:
+        if route == "retrieve":
+            try:
+                prefetched = speculative.result()
+                speculation_counters["used"] += 1
+            except Exception as e:
+                print(f"Speculative retrieval failed, retrieving normally: {e}")
+        else:
+            cancelled.set()
+            speculative.cancel()
+            speculation_counters["discarded"] += 1
+    return _decision(state, route, question_embedding, prefetched)
+
+async def aroute_question(state, vector_db):
+    """Async version of route_question."""
+    question = state["question"]
+
+    if _keyword_route(state):
+        return _decision(state, "retrieve")
+
+    question_embedding = state.get("question_embedding")
+    try:
+        if question_embedding is None:
+            question_embedding = await aembed_question(question, vector_db)
+        if await ashould_use_vectorstore(question, vector_db, threshold=ROUTING_SIMILARITY_THRESHOLD, k=3,
+                                         question_embedding=question_embedding):
+            return _decision(state, "retrieve", question_embedding)
+    except Exception:
+        pass
+
+    speculative = None
+    if SPECULATIVE_RETRIEVAL:
+        speculative = asyncio.create_task(aprefetch_retrieval(
+            {**state, "question_embedding": question_embedding}, vector_db, SPECULATIVE_EXPANSION
+        ))
+    try:
+        route_msg = await routing_runnable.ainvoke(_routing_inputs(state))
+    except Exception:
+        if speculative:
+            speculative.cancel()
+        raise
+    route = _parse_route(route_msg)
+
+    prefetched = None
+    if speculative:
+        if route == "retrieve":
+            try:
+                prefetched = await speculative
+                speculation_counters["used"] += 1
+            except Exception as e:
+                print(f"Speculative retrieval failed, retrieving normally: {e}")
+        else:
+            speculative.cancel()
+            speculation_counters["discarded"] += 1
+    return _decision(state, route, question_embedding, prefetched)
@@ -1,4 +1,39 @@
+import threading
 from core.prompts import web_search_runnable
+from core.web_search import CachedWebSearch, OfflineSearchTool, tavily_search_tool
+from app.config import (
+    WEB_SEARCH_PROVIDER, WEB_SEARCH_OFFLINE_PATH, WEB_SEARCH_TIMEOUT_S, WEB_SEARCH_CACHE_TTL_S,
+    WEB_SEARCH_CACHE_MAX_ENTRIES,
+)
+
+NO_RESULTS = "No web results are available right now; answer from general knowledge and say so."
+
+_default_tool = None
+_default_tool_lock = threading.Lock()
+
+def _provider_tool(provider: str):
+    if provider == "offline":
+        return OfflineSearchTool(WEB_SEARCH_OFFLINE_PATH)
+    if provider == "tavily":
+        # Requests give up when callers do, so hung searches release their worker
+        return tavily_search_tool(timeout_s=WEB_SEARCH_TIMEOUT_S)
+    raise ValueError(f"Unknown WEB_SEARCH_PROVIDER: {provider!r} (expected 'tavily' or 'offline')")
+
+def default_web_search_tool():
+    """One cached, time-limited search client for every session, created on first use."""
+    global _default_tool
+    with _default_tool_lock:
+        if _default_tool is None:
+            _default_tool = CachedWebSearch(
+                _provider_tool(WEB_SEARCH_PROVIDER),
+                ttl_seconds=WEB_SEARCH_CACHE_TTL_S,
+                max_entries=WEB_SEARCH_CACHE_MAX_ENTRIES,
+                timeout_s=WEB_SEARCH_TIMEOUT_S,
+            )
+        return _default_tool
+
+def _format_results(docs):
+    return "\n".join([d.get("content", "") for d in docs if isinstance(d, dict)]) or NO_RESULTS
 
 def web_search(state, web_search_tool):
     """
@@ -11,9 +46,23 @@ def web_search(state, web_search_tool):
 
     # Get web search results
     docs = web_search_tool.invoke({"query": question})
-    web_results = "\n".join([d.get("content", "") for d in docs])
+    web_results = _format_results(docs)
 
     # Use RunnableSequence to generate answer
     generation = web_search_runnable.invoke({"question": question, "web_results": web_results})
 
-    return {"question": question, "generation": getattr(generation, "content", str(generation))}
\ No newline at end of file
+    return {"question": question, "generation": getattr(generation, "content", str(generation))}
+
+
+async def aweb_search(state, web_search_tool):
+    """Async version of web_search."""
+    question = state.get("question", "")
+    if not question:
+        return {"question": "", "generation": "⚠️ No question provided for web search."}
+
+    docs = await web_search_tool.ainvoke({"query": question})
+    web_results = _format_results(docs)
+
+    generation = await web_search_runnable.ainvoke({"question": question, "web_results": web_results})
+
+    return {"question": question, "generation": getattr(generation, "content", str(generation))}
@@ -1,5 +1,6 @@
+import time
 from typing_extensions import TypedDict
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 class GraphState(TypedDict):
@@ -8,8 +9,32 @@ class GraphState(TypedDict):
     resume_text: str
     documents: List[str]
     job_description: str 
-    chat_history: List[dict]
+    chat_history: List[dict]   # recent turns only (see core.chat_history.ChatMemory)
+    history_summary: str       # rolling summary of the older turns
+    metadata_summary: str
+    route: str
+    question_embedding: Optional[List[float]]  # computed once per turn, shared by routing and retrieval
+    prefetched_retrieval: Optional[dict]  # speculative retrieval results handed from route to retrieve
+    started_at: float          # time.monotonic() when the request entered the graph
+    attempts: int              # number of RAG generations this turn
+    grade: str                 # latest grading outcome
+    best_generation: str       # best graded answer so far, returned when the budget runs out
+    best_grade: str
 
 class GradeAnswer(BaseModel):
     binary_score: str = Field(description="yes/no if it answers the question")
     hallucination: str = Field(description="yes/no if contains unsupported info")
+
+class GradingPolicy(BaseModel):
+    max_retries: int = Field(2, description="regenerations allowed after a 'not supported' grade")
+    latency_budget_s: float = Field(30.0, description="wall-clock budget per request, in seconds")
+
+    def elapsed(self, state) -> float:
+        started_at = state.get("started_at")
+        return time.monotonic() - started_at if started_at else 0.0
+
+    def budget_exhausted(self, state) -> bool:
+        return self.elapsed(state) >= self.latency_budget_s
+
+    def can_retry(self, state) -> bool:
+        return state.get("attempts", 0) <= self.max_retries and not self.budget_exhausted(state)
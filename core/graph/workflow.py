@@ -1,52 +1,108 @@
+from functools import partial
 from langgraph.graph import StateGraph, START, END
+from langchain_core.runnables import RunnableLambda
 
-from .types import GraphState
-from .nodes.retrieval import retrieve
-from .nodes.generation import generate, llm_fallback
-from .nodes.web_search import web_search
-from .nodes.routing import route_question
-from .nodes.grading import grade_generation
+from app.config import MAX_GENERATION_RETRIES, REQUEST_LATENCY_BUDGET_S
+from .types import GraphState, GradingPolicy
+from .nodes.retrieval import retrieve, aretrieve
+from .nodes.generation import generate, llm_fallback, agenerate, allm_fallback
+from .nodes.web_search import web_search, aweb_search, default_web_search_tool
+from .nodes.routing import route_question, select_route, aroute_question
+from .nodes.grading import grade_node, agrade_node, decide_after_grading, finalize_generation
 
-def build_workflow(vector_db, web_search_tool):
+# Per-session resources travel in config["configurable"], so one compiled graph serves every session
+VECTOR_DB = "vector_db"
+WEB_SEARCH_TOOL = "web_search_tool"
+
+def workflow_config(vector_db, web_search_tool=None, **configurable):
+    """Runtime config for the shared workflow: this session's vector store (and optional search tool)."""
+    return {"configurable": {VECTOR_DB: vector_db, WEB_SEARCH_TOOL: web_search_tool, **configurable}}
+
+def _resources(config, names):
+    configurable = (config or {}).get("configurable") or {}
+    resources = {name: configurable.get(name) for name in names}
+    if VECTOR_DB in resources and resources[VECTOR_DB] is None:
+        raise ValueError("Workflow config is missing the session's vector_db (see workflow_config)")
+    if WEB_SEARCH_TOOL in resources and resources[WEB_SEARCH_TOOL] is None:
+        resources[WEB_SEARCH_TOOL] = default_web_search_tool()
+    return resources
+
+def _node(func, afunc, resources=(), **bound):
+    """
+    Runnable with both a sync and an async implementation, so the graph supports stream and astream.
+    Names in resources are looked up in the runtime config on every call.
+    """
+    if not resources:
+        return RunnableLambda(partial(func, **bound), afunc=partial(afunc, **bound), name=func.__name__)
+
+    def call(state, config):
+        return func(state, **_resources(config, resources), **bound)
+
+    async def acall(state, config):
+        return await afunc(state, **_resources(config, resources), **bound)
+
+    return RunnableLambda(call, afunc=acall, name=func.__name__)
+
+def build_workflow(policy: GradingPolicy = None):
+    """Compile the chat graph; bind a session at call time with config=workflow_config(vector_db)."""
+    policy = policy or GradingPolicy(max_retries=MAX_GENERATION_RETRIES, latency_budget_s=REQUEST_LATENCY_BUDGET_S)
     workflow = StateGraph(GraphState)
 
     workflow.add_node(
-        "retrieve", 
-        lambda state: retrieve(state, vector_db)
+        "retrieve",
+        _node(retrieve, aretrieve, resources=[VECTOR_DB])
     )
-    
+
     workflow.add_node(
         "generate",
-        lambda state: generate(state, vector_db)
+        _node(generate, agenerate)
     )
     workflow.add_node(
         "web_search",
-        lambda state: web_search(state, web_search_tool)
+        _node(web_search, aweb_search, resources=[WEB_SEARCH_TOOL])
     )
 
-    workflow.add_node("llm_fallback", llm_fallback)
+    workflow.add_node("llm_fallback", _node(llm_fallback, allm_fallback))
 
+    workflow.add_node(
+        "grade",
+        _node(grade_node, agrade_node, policy=policy)
+    )
+    workflow.add_node("finalize", finalize_generation)
+
+    workflow.add_node(
+        "route",
+        _node(route_question, aroute_question, resources=[VECTOR_DB])
+    )
+
+    workflow.add_edge(START, "route")
     workflow.add_conditional_edges(
-        START,
-        lambda state: route_question(state, vector_db),
+        "route",
+        select_route,
         {
-            "retrieve":"retrieve", 
-            "web_search":"web_search", 
+            "retrieve":"retrieve",
+            "web_search":"web_search",
             "llm_fallback":"llm_fallback"
         }
     )
 
     workflow.add_edge("retrieve", "generate")
+    workflow.add_edge("generate", "grade")
     workflow.add_conditional_edges(
-        "generate",
-        grade_generation,
+        "grade",
+        partial(decide_after_grading, policy=policy),
         {
-            "useful":END, 
-            "not useful":"web_search", 
-            "not supported":"generate"
+            "useful":END,
+            "not useful":"web_search",
+            "not supported":"generate",
+            "give up":"finalize"
         }
     )
+    workflow.add_edge("finalize", END)
     workflow.add_edge("llm_fallback", END)
     workflow.add_edge("web_search", END)
 
     return workflow.compile()
+
+# Compiled once at import and shared by all sessions
+chat_workflow = build_workflow()
@@ -0,0 +1,138 @@
+# llm_cache.py
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Iterator, Optional
+from langchain_core.callbacks import AsyncCallbackManager, CallbackManager
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, LLMResult
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables.config import ensure_config
+from core.cache_store import CacheStats, SQLiteCacheStore
+
+# Set {"configurable": {LLM_CACHE_REFRESH: True}} to skip the cache read (e.g. on regeneration);
+# the fresh response still replaces the cached one.
+LLM_CACHE_REFRESH = "llm_cache_refresh"
+
+
+class CachedPromptRunnable(Runnable):
+    """
+    prompt | llm with an exact-match response cache in front of the model call.
+    The key is (model, temperature, rendered prompt), so a hit is only possible for
+    an identical request; responses are stored as text and returned as AIMessages.
+    Hits are reported to callbacks as a chat model run, so streaming consumers (LangGraph's
+    "messages" mode) see cached answers like generated ones.
+    """
+
+    def __init__(self, prompt, llm, name: str, store: SQLiteCacheStore, enabled: bool = True):
+        self.prompt = prompt
+        self.llm = llm
+        self.name = name
+        self.store = store
+        self.enabled = enabled
+        self.stats = CacheStats()
+
+    def _key(self, prompt_value) -> str:
+        model = getattr(self.llm, "model_name", None) or getattr(self.llm, "model", type(self.llm).__name__)
+        temperature = getattr(self.llm, "temperature", None)
+        raw = f"{model}\x00{temperature}\x00{prompt_value.to_string()}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _lookup(self, prompt_value, config):
+        """Return (key, cached text or None); key is None when caching is off for this call."""
+        if not self.enabled:
+            return None, None
+        key = self._key(prompt_value)
+        if (config.get("configurable") or {}).get(LLM_CACHE_REFRESH):
+            return key, None
+        cached = self.store.get(key)
+        self.stats.record(hits=cached is not None, misses=cached is None)
+        return key, cached.decode("utf-8") if cached is not None else None
+
+    def _store(self, key, text: str):
+        if key is not None and text:
+            self.store.put(key, text.encode("utf-8"))
+
+    def _callback_manager(self, manager_cls, config):
+        return manager_cls.configure(
+            config.get("callbacks"), inheritable_tags=config.get("tags"), inheritable_metadata=config.get("metadata")
+        )
+
+    @staticmethod
+    def _replay_result(run_id, text: str, streamed: bool):
+        message = (AIMessageChunk if streamed else AIMessage)(content=text, id=f"run-{run_id}")
+        generation = ChatGenerationChunk(message=message) if streamed else ChatGeneration(message=message)
+        return message, generation
+
+    def _replay(self, prompt_value, text: str, config, streamed: bool):
+        """Report a cached response as a chat model run (one token when streamed) and return the message."""
+        run_manager = self._callback_manager(CallbackManager, config).on_chat_model_start(
+            {"name": self.name}, [prompt_value.to_messages()], name=self.name
+        )[0]
+        message, generation = self._replay_result(run_manager.run_id, text, streamed)
+        if streamed:
+            run_manager.on_llm_new_token(text, chunk=generation)
+        run_manager.on_llm_end(LLMResult(generations=[[generation]]))
+        return message
+
+    async def _areplay(self, prompt_value, text: str, config, streamed: bool):
+        """Async version of _replay."""
+        run_manager = (await self._callback_manager(AsyncCallbackManager, config).on_chat_model_start(
+            {"name": self.name}, [prompt_value.to_messages()], name=self.name
+        ))[0]
+        message, generation = self._replay_result(run_manager.run_id, text, streamed)
+        if streamed:
+            await run_manager.on_llm_new_token(text, chunk=generation)
+        await run_manager.on_llm_end(LLMResult(generations=[[generation]]))
+        return message
+
+    # --- Runnable interface ---
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs) -> AIMessage:
+        config = ensure_config(config)
+        prompt_value = self.prompt.invoke(input, config)
+        key, cached = self._lookup(prompt_value, config)
+        if cached is not None:
+            return self._replay(prompt_value, cached, config, streamed=False)
+        response = self.llm.invoke(prompt_value, config, **kwargs)
+        self._store(key, response.content)
+        return response
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs) -> AIMessage:
+        config = ensure_config(config)
+        prompt_value = await self.prompt.ainvoke(input, config)
+        # sqlite reads and writes block, so they run on a worker thread instead of the event loop
+        key, cached = await asyncio.to_thread(self._lookup, prompt_value, config)
+        if cached is not None:
+            return await self._areplay(prompt_value, cached, config, streamed=False)
+        response = await self.llm.ainvoke(prompt_value, config, **kwargs)
+        await asyncio.to_thread(self._store, key, response.content)
+        return response
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs) -> Iterator[AIMessageChunk]:
+        config = ensure_config(config)
+        prompt_value = self.prompt.invoke(input, config)
+        key, cached = self._lookup(prompt_value, config)
+        if cached is not None:
+            yield self._replay(prompt_value, cached, config, streamed=True)
+            return
+        text = ""
+        for chunk in self.llm.stream(prompt_value, config, **kwargs):
+            text += chunk.content
+            yield chunk
+        # Only complete responses are cached
+        self._store(key, text)
+
+    async def astream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs) -> AsyncIterator[AIMessageChunk]:
+        config = ensure_config(config)
+        prompt_value = await self.prompt.ainvoke(input, config)
+        key, cached = await asyncio.to_thread(self._lookup, prompt_value, config)
+        if cached is not None:
+            yield await self._areplay(prompt_value, cached, config, streamed=True)
+            return
+        text = ""
+        async for chunk in self.llm.astream(prompt_value, config, **kwargs):
+            text += chunk.content
+            yield chunk
+        await asyncio.to_thread(self._store, key, text)
+
+    def __repr__(self):
+        return f"CachedPromptRunnable(name={self.name!r}, enabled={self.enabled}, {self.stats})"
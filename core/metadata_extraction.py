@@ -1,8 +1,10 @@
+import re
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel
 from typing import List, Union, Optional
-from langchain_openai import ChatOpenAI
-from app.config import MODEL_NAME
+from core.section_matcher import KeywordAutomaton, leftmost_longest
+from core.skills_gazetteer import iter_entries, CASE_SENSITIVE, SOFT_SKILLS
+from core.prompts import extract_metadata_runnable
 
 class ResumeMetadata(BaseModel):
     skills: Optional[List[str]] = None
@@ -11,27 +13,189 @@ class ResumeMetadata(BaseModel):
     tags: Optional[List[str]] = None
     experience_headers: Optional[List[str]] = None
     education_headers: Optional[List[Union[str, dict]]] = None
-    section_headers: Optional[List[str]] = None  
+    section_headers: Optional[List[str]] = None
 
-def extract_metadata(resume_text: str) -> ResumeMetadata:
+# --- Local (deterministic) extraction ---
+
+# Common header wordings, by the kind of section they introduce
+HEADER_ALIASES = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "about me",
+                "objective", "career objective", "career summary"],
+    "experience": ["experience", "professional experience", "work experience", "employment",
+                   "employment history", "work history", "relevant experience", "internships"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "selected projects"],
+    "education": ["education", "academic background", "education and training", "qualifications"],
+    "skills": ["skills", "technical skills", "core competencies", "competencies", "technologies",
+               "tools", "skills and tools", "key skills"],
+    "certifications": ["certifications", "certificates", "licenses and certifications", "courses"],
+    "other": ["awards", "achievements", "honors", "publications", "languages", "interests", "hobbies",
+              "volunteering", "volunteer experience", "leadership", "activities", "references"],
+}
+_ALIAS_KIND = {alias: kind for kind, aliases in HEADER_ALIASES.items() for alias in aliases}
+# Words that make a short ALL CAPS line a header even when its exact wording is unknown
+_HEADER_WORDS = {word for alias in _ALIAS_KIND for word in alias.split()} | {"learning", "training", "certification"}
+
+_BULLET = re.compile(r'^\s*[•●▪■◦‣∙·\-*o]\s')
+_DATE_LINE = re.compile(
+    r'^[\s(]*((jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+)?\d{4}\s*[-–—to]+\s*'
+    r'(((jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+)?\d{4}|present|current|now)[\s)]*$',
+    re.IGNORECASE,
+)
+_ENTRY_TITLE_END = re.compile(r'\s*[,(|]')
+
+# Confidence thresholds below which a field is left to the LLM
+MIN_SECTION_HEADERS = 2
+MIN_SKILLS = 3
+
+_skills_automaton = None
+_skill_categories = {}
+
+def _get_skills_automaton():
+    global _skills_automaton
+    if _skills_automaton is None:
+        for alias, name, category in iter_entries():
+            _skill_categories[name] = category
+        _skills_automaton = KeywordAutomaton((alias, name) for alias, name, _ in iter_entries())
+    return _skills_automaton
+
+def _header_kind(line: str):
+    """Section kind for a header line, or None if the line doesn't look like a header."""
+    text = line.strip().rstrip(":").strip()
+    if not text or len(text) > 40 or len(text.split()) > 4:
+        return None
+    normalized = re.sub(r'\s+', ' ', text.lower().replace("&", "and"))
+    if normalized in _ALIAS_KIND:
+        return _ALIAS_KIND[normalized]
+    # Layout heuristic: short ALL CAPS line containing a typical header word
+    words = set(re.findall(r'[a-z]+', normalized))
+    if text.isupper() and not any(c.isdigit() for c in text) and words & _HEADER_WORDS:
+        return "other"
+    return None
+
+def _split_sections(lines):
+    """[(header line, kind, body lines)] for every detected section, in order."""
+    sections = []
+    for line in lines:
+        kind = _header_kind(line)
+        if kind:
+            sections.append((line.strip().rstrip(":").strip(), kind, []))
+        elif sections:
+            sections[-1][2].append(line)
+    return sections
+
+def _entry_lines(body):
+    """
+    Titles of the entries in a section: the first non-bullet line of each block.
+    Bullet continuations, dates and sentences are skipped.
+    """
+    entries, in_block, continues = [], False, False
+    for raw in body:
+        line = raw.strip()
+        if not line:
+            continue
+        if _BULLET.match(raw):
+            in_block, continues = False, not line.endswith((".", "!", "?"))
+            continue
+        if continues:
+            # Wrapped bullet text
+            continues = not line.endswith((".", "!", "?"))
+            continue
+        if in_block or line.endswith(".") or _DATE_LINE.match(line) or len(line.split()) > 14:
+            continue
+        # Chunking splits entries on commas, so keep the title before any comma/parenthesis
+        entries.append(_ENTRY_TITLE_END.split(line, 1)[0])
+        in_block = True
+    return entries
+
+def _match_skills(resume_text: str):
+    """Gazetteer skills as whole words, in order of first appearance: (skills, tech_stack, tags)."""
+    automaton = _get_skills_automaton()
+    hits = []
+    for hit in automaton.iter_hits(resume_text):
+        before = resume_text[hit.start - 1] if hit.start else " "
+        after = resume_text[hit.end] if hit.end < len(resume_text) else " "
+        if before.isalnum() or after.isalnum() or (after in "+#" and not hit.keyword.endswith(("+", "#"))):
+            continue
+        if hit.keyword in CASE_SENSITIVE and resume_text[hit.start:hit.end] != hit.keyword:
+            continue
+        hits.append(hit)
+
+    skills, tags = [], []
+    for hit in leftmost_longest(hits):
+        name = hit.kind
+        if name not in skills:
+            skills.append(name)
+        category = _skill_categories[name]
+        if category != "soft" and category not in tags:
+            tags.append(category)
+    tech_stack = [s for s in skills if s not in SOFT_SKILLS]
+    return skills, tech_stack, tags
+
+def extract_metadata_local(resume_text: str):
+    """
+    Header dictionary + layout heuristics for sections and entry titles, and a skills
+    gazetteer for skills/tech_stack/tags. Returns (metadata, unresolved field names).
+    """
+    sections = _split_sections(resume_text.splitlines())
+    metadata = ResumeMetadata(section_headers=[header for header, _, _ in sections])
+    unresolved = []
+
+    if len(sections) < MIN_SECTION_HEADERS or all(kind == "other" for _, kind, _ in sections):
+        unresolved.append("section_headers")
+
+    for field, kind in (("project_headers", "projects"), ("experience_headers", "experience"),
+                        ("education_headers", "education")):
+        bodies = [body for _, k, body in sections if k == kind]
+        if not bodies:
+            continue  # no such section: nothing to find
+        entries = [entry for body in bodies for entry in _entry_lines(body)]
+        if entries:
+            setattr(metadata, field, entries)
+        else:
+            unresolved.append(field)
+
+    skills, tech_stack, tags = _match_skills(resume_text)
+    metadata.skills, metadata.tech_stack, metadata.tags = skills, tech_stack, tags
+    if len(skills) < MIN_SKILLS:
+        unresolved.extend(["skills", "tech_stack"])
+
+    return metadata, unresolved
+
+def extract_metadata(resume_text: str, use_llm: bool = True) -> ResumeMetadata:
+    """
+    Extract metadata locally; the LLM is only asked for the fields the local
+    extractor could not resolve with confidence.
+    """
+    metadata, unresolved = extract_metadata_local(resume_text)
+    if not unresolved or not use_llm:
+        return metadata
+
+    print(f"🤖 Metadata fields left to the LLM: {unresolved}")
+    try:
+        llm_metadata = _extract_metadata_llm(resume_text, unresolved)
+    except Exception as e:
+        print(f"LLM metadata extraction failed, using local results: {e}")
+        return metadata
+
+    for field in unresolved:
+        value = getattr(llm_metadata, field)
+        if value:
+            setattr(metadata, field, value)
+    return metadata
+
+def _extract_metadata_llm(resume_text: str, fields) -> ResumeMetadata:
     parser = PydanticOutputParser(pydantic_object=ResumeMetadata)
-    llm = ChatOpenAI(model_name=MODEL_NAME)
-    response = llm.invoke(
-        f"""
-        Extract metadata from the resume text in the given format.
-        
-        Resume text:
-        {resume_text}
-        
-        {parser.get_format_instructions()}
-        """
-    )
+    response = extract_metadata_runnable.invoke({
+        "resume_text": resume_text,
+        "fields": ", ".join(fields),
+        "format_instructions": parser.get_format_instructions(),
+    })
 
     if hasattr(response, "content"):  # AIMessage object
         response = response.content
     elif isinstance(response, list):  # list of AIMessage
         response = " ".join([r.content if hasattr(r, "content") else str(r) for r in response])
-    
+
     return parser.parse(response)
 
 def convert_metadata_for_chroma(metadata: ResumeMetadata) -> dict:
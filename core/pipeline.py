@@ -0,0 +1,57 @@
+# pipeline.py
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class Stage:
+    """One step of a pipeline: func(ctx) -> result, run once all deps have finished."""
+
+    def __init__(self, name: str, func, deps=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+
+
+def run_stages(stages, inputs: dict = None, max_workers: int = 4, timings: dict = None) -> dict:
+    """
+    Run a DAG of stages, starting each stage as soon as its dependencies are done, so
+    independent stages overlap. Every stage runs exactly once. ctx holds the inputs plus
+    the result of each finished stage under its name. The first failing stage's exception is raised.
+    """
+    stages = {s.name: s for s in stages}
+    for stage in stages.values():
+        missing = [d for d in stage.deps if d not in stages and d not in (inputs or {})]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {missing}")
+
+    ctx = dict(inputs or {})
+    pending = dict(stages)
+    running = {}
+
+    def timed(stage, snapshot):
+        start = time.perf_counter()
+        result = stage.func(snapshot)
+        if timings is not None:
+            timings[stage.name] = time.perf_counter() - start
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline") as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(d in ctx for d in stage.deps):
+                    running[pool.submit(timed, stage, dict(ctx))] = name
+                    del pending[name]
+
+            if not running:
+                raise ValueError(f"Pipeline has a dependency cycle: {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    ctx[name] = future.result()
+                except Exception:
+                    for other in running:
+                        other.cancel()
+                    raise
+    return ctx
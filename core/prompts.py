@@ -1,7 +1,10 @@
 from langchain.prompts import PromptTemplate
-from langchain.schema.runnable import RunnableSequence
 from langchain_openai import ChatOpenAI
-from app.config import MODEL_NAME, TEMPERATURE
+from app.config import (
+    MODEL_NAME, TEMPERATURE, LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_MAX_MB, LLM_CACHE_TTL_S, LLM_CACHE_DISABLED
+)
+from core.cache_store import SQLiteCacheStore
+from core.llm_cache import CachedPromptRunnable
 
 llm = ChatOpenAI(model_name=MODEL_NAME, temperature=TEMPERATURE)
 
@@ -271,6 +274,8 @@ WEB_SEARCH_PROMPT = PromptTemplate(
     """
 )
 
+# Only used by the legacy core/skills_graph/skills_workflow.py; the skills flow computes skill
+# sets locally and uses SKILLS_FIT_PROMPT below.
 EXTRACT_SKILLS_PROMPT = PromptTemplate(
     input_variables=["resume_text", "jd_text", "format_instructions"],
     template="""
@@ -303,6 +308,34 @@ Job Description:
 """
 )
 
+SKILLS_FIT_PROMPT = PromptTemplate(
+    input_variables=["resume_text", "jd_text", "matching_skills", "missing_skills", "format_instructions"],
+    template="""
+You are an **ATS Optimization and Career Intelligence Expert**.
+
+The skills comparison has already been computed for the skills in our skills dictionary:
+- Matching skills: {matching_skills}
+- Missing skills: {missing_skills}
+
+These lists only cover skills the dictionary knows. Using them together with the resume and job description:
+1. List in "other_job_description_skills" any other skills the job description requires
+   (short skill names only, e.g. "Snowflake", "SOC 2"); leave it empty if there are none.
+2. Provide **ATS optimization suggestions** (keyword inclusion, phrasing improvements).
+3. Score the **overall job fit** from 0 to 100 based on all required skills, experience relevance,
+   achievement quality, role seniority and ATS readiness.
+4. Provide a short, data-backed reasoning for the score.
+
+Return **only valid JSON** matching this schema:
+{format_instructions}
+
+Resume:
+{resume_text}
+
+Job Description:
+{jd_text}
+"""
+)
+
 RESUME_SUGGESTIONS_PROMPT = PromptTemplate(
     input_variables=["resume_text", "jd_text", "skills_comparison"],
     template="""
@@ -320,13 +353,63 @@ Output **only JSON** following this schema:
 """
 )
 
-# ---- RunnableSequences ----
-summarize_jd_runnable = RunnableSequence(SUMMARIZE_JD_PROMPT | llm)
-routing_runnable = RunnableSequence(ROUTING_PROMPT | llm)
-rag_runnable = RunnableSequence(RAG_PROMPT | llm)
-expand_query_runnable = RunnableSequence(EXPAND_QUERY_PROMPT | llm)
-grade_generation_runnable = RunnableSequence(GRADE_GENERATION_PROMPT | llm)
-web_search_runnable = RunnableSequence(WEB_SEARCH_PROMPT | llm)
-extract_skills_runnable = RunnableSequence(EXTRACT_SKILLS_PROMPT | llm)
-generate_suggestions_runnable = RunnableSequence(RESUME_SUGGESTIONS_PROMPT | llm)
-llm_fallback_runnable = RunnableSequence(LLM_FALLBACK_PROMPT | llm)
\ No newline at end of file
+SUMMARIZE_HISTORY_PROMPT = PromptTemplate(
+    input_variables=["summary", "new_lines"],
+    template="""
+Progressively summarize a conversation between a user and a resume assistant.
+Extend the current summary with the new lines. Keep names, skills, roles, companies and
+open questions the user may refer back to. Reply with the new summary only, at most 120 words.
+
+Current summary:
+{summary}
+
+New lines:
+{new_lines}
+"""
+)
+
+EXTRACT_METADATA_PROMPT = PromptTemplate(
+    input_variables=["resume_text", "fields", "format_instructions"],
+    template="""
+Extract metadata from the resume text in the given format.
+Only fill these fields: {fields}. Leave every other field null.
+
+Resume text:
+{resume_text}
+
+{format_instructions}
+"""
+)
+
+# Tag on runnables whose tokens are the user-facing answer (streamed to the chat UI)
+ANSWER_STREAM_TAG = "answer_stream"
+
+# ---- Runnables (prompt | llm behind the exact-match response cache) ----
+llm_cache_store = SQLiteCacheStore(
+    LLM_CACHE_PATH, table="llm_responses", max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024, ttl_seconds=LLM_CACHE_TTL_S
+)
+cached_runnables = {}
+
+def _cached(name, prompt):
+    runnable = CachedPromptRunnable(
+        prompt, llm, name, llm_cache_store, enabled=LLM_CACHE_ENABLED and name not in LLM_CACHE_DISABLED
+    )
+    cached_runnables[name] = runnable
+    return runnable
+
+def llm_cache_stats():
+    """Hit/miss counters per prompt runnable, for monitoring."""
+    return {name: {"enabled": r.enabled, **r.stats.as_dict()} for name, r in cached_runnables.items()}
+
+summarize_jd_runnable = _cached("summarize_jd", SUMMARIZE_JD_PROMPT)
+routing_runnable = _cached("routing", ROUTING_PROMPT)
+rag_runnable = _cached("rag", RAG_PROMPT).with_config(tags=[ANSWER_STREAM_TAG])
+expand_query_runnable = _cached("expand_query", EXPAND_QUERY_PROMPT)
+grade_generation_runnable = _cached("grade_generation", GRADE_GENERATION_PROMPT)
+web_search_runnable = _cached("web_search", WEB_SEARCH_PROMPT).with_config(tags=[ANSWER_STREAM_TAG])
+extract_skills_runnable = _cached("extract_skills", EXTRACT_SKILLS_PROMPT)  # legacy, see EXTRACT_SKILLS_PROMPT
+skills_fit_runnable = _cached("skills_fit", SKILLS_FIT_PROMPT)
+generate_suggestions_runnable = _cached("generate_suggestions", RESUME_SUGGESTIONS_PROMPT)
+extract_metadata_runnable = _cached("extract_metadata", EXTRACT_METADATA_PROMPT)
+summarize_history_runnable = _cached("summarize_history", SUMMARIZE_HISTORY_PROMPT)
+llm_fallback_runnable = _cached("llm_fallback", LLM_FALLBACK_PROMPT).with_config(tags=[ANSWER_STREAM_TAG])
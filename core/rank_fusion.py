@@ -0,0 +1,29 @@
+# rank_fusion.py
+from typing import Dict, List, Tuple
+from langchain.schema import Document
+
+
+def doc_key(doc: Document) -> tuple:
+    """Identity of a retrieved chunk: the same text can appear as different chunk types."""
+    meta = doc.metadata or {}
+    return (doc.page_content, meta.get("type"), meta.get("section"))
+
+
+def reciprocal_rank_fusion(ranked_lists: List[List[Document]], k: int = 60, top_n: int = None) -> List[Tuple[Document, float]]:
+    """
+    Merge several ranked result lists with reciprocal rank fusion:
+    score(d) = sum over lists of 1 / (k + rank of d in that list).
+    Returns (document, score) pairs, best first.
+    """
+    scores: Dict[tuple, float] = {}
+    docs: Dict[tuple, Document] = {}
+    for ranked in ranked_lists:
+        for rank, doc in enumerate(ranked, 1):
+            key = doc_key(doc)
+            docs.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+
+    fused = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    if top_n is not None:
+        fused = fused[:top_n]
+    return [(docs[key], score) for key, score in fused]
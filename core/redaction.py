@@ -0,0 +1,80 @@
+# redaction.py
+import re
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, NamedTuple
+
+# Detectors and their replacements; whitespace runs are collapsed in the same pass.
+# At a given position the first matching branch wins, so EMAIL precedes PHONE
+# (an address may start with digits), as it did when they ran as separate passes.
+# Branches that reject most positions on a single character go first.
+DETECTORS = [
+    ("SPACES", r' {2,}', " "),
+    ("NEWLINES", r'\n{2,}', "\n"),
+    ("EMAIL", r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "EMAIL_REDACTED"),
+    ("URL", r'https?://\S+', "URL_REDACTED"),
+    # The lookahead rejects non-digit positions before trying the optional groups
+    ("PHONE", r'(?=[+(\d])(?:\+?\d{1,3}[\s.-]?)?(?:\(?\d{3}\)?[\s.-]?)\d{3}\s*[\-.\s]\s*\d{4}', "PHONE_REDACTED"),
+]
+
+_REPLACEMENTS = {name: replacement for name, _, replacement in DETECTORS}
+_PATTERN = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern, _ in DETECTORS))
+
+
+class Span(NamedTuple):
+    kind: str
+    start: int       # [start, end) in the original text
+    end: int
+    out_start: int   # [out_start, out_end) in the redacted text
+    out_end: int
+
+
+class RedactionResult(NamedTuple):
+    text: str
+    spans: List[Span]   # every substitution, in order
+
+    def original_offset(self, offset: int) -> int:
+        """Map an offset in the redacted text back to the original text."""
+        i = bisect_right([s.out_start for s in self.spans], offset) - 1
+        if i < 0:
+            return offset
+        span = self.spans[i]
+        if offset < span.out_end:
+            return span.start  # inside a replacement: its original start
+        return span.end + (offset - span.out_end)
+
+    def redacted_offset(self, offset: int) -> int:
+        """Map an offset in the original text to the redacted text."""
+        i = bisect_right([s.start for s in self.spans], offset) - 1
+        if i < 0:
+            return offset
+        span = self.spans[i]
+        if offset < span.end:
+            return span.out_start
+        return span.out_end + (offset - span.end)
+
+
+def redact(text: str) -> RedactionResult:
+    """
+    Redact emails, URLs and phone numbers and collapse repeated spaces/newlines,
+    in a single scan over the text with all detectors compiled into one pattern.
+    """
+    pieces, spans = [], []
+    pos = out = 0
+    for match in _PATTERN.finditer(text):
+        start, end = match.span()
+        if start > pos:
+            pieces.append(text[pos:start])
+            out += start - pos
+        replacement = _REPLACEMENTS[match.lastgroup]
+        pieces.append(replacement)
+        spans.append(Span(match.lastgroup, start, end, out, out + len(replacement)))
+        out += len(replacement)
+        pos = end
+    pieces.append(text[pos:])
+    return RedactionResult("".join(pieces), spans)
+
+
+def redact_pages(page_texts: Iterable[str]) -> Iterator[RedactionResult]:
+    """Redact page texts as they are extracted; spans are relative to each page."""
+    for text in page_texts:
+        yield redact(text)
@@ -1,5 +1,6 @@
-import re
 from langchain.schema import Document
+from core.section_matcher import SectionMatcher, leftmost_longest
+from core.resume_processing import page_for_offset
 
 def print_docs(docs):
     for i, doc in enumerate(docs, 1):
@@ -10,9 +11,29 @@ def print_docs(docs):
         print(doc.page_content.strip())
         print("="*60, "\n")
 
-def chunk_resume(resume_text: str, metadata: dict = None):
+# Sections whose entries (from metadata) are split into item chunks
+ITEM_SECTIONS = {
+    "projects": "projects",
+    "experience": "experience",
+    "professional experience": "experience",
+    "education": "education",
+}
+
+def _split_list(value):
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return [v.strip() for v in value or [] if v and v.strip()]
+
+def build_section_matcher(metadata: dict) -> SectionMatcher:
+    """One automaton per resume over its section headers and item entries."""
+    entries = {key: _split_list(metadata.get(key, "")) for key in set(ITEM_SECTIONS.values())}
+    return SectionMatcher(_split_list(metadata.get("section_headers", "")), entries)
+
+def chunk_resume(resume_text: str, metadata: dict = None, page_offsets: list = None, matcher: SectionMatcher = None):
     """
     Chunk resume into macro (section) and micro (items) using section headers from metadata.
+    Headers and entries are found in one pass over the text; section and item chunks carry
+    their start/end character offsets, and the page they start on if page_offsets is given.
     """
 
     if metadata is None:
@@ -25,74 +46,53 @@ def chunk_resume(resume_text: str, metadata: dict = None):
         metadata={**metadata, "section": "full", "type": "full_resume"}
     ))
 
-    # Normalize headers from metadata
-    sections_raw = metadata.get("section_headers", "")
-    if isinstance(sections_raw, str):
-        section_headers = [s.strip() for s in sections_raw.split(",") if s.strip()]
-    else:
-        section_headers = [s.strip() for s in sections_raw]
-    section_headers = [h.upper() for h in section_headers]
+    matcher = matcher or build_section_matcher(metadata)
+    headers, entry_hits = matcher.scan(resume_text)
 
-    # Build regex pattern to match headers (ignore case, optional colon)
-    header_pattern = r'^\s*(' + '|'.join([re.escape(h) for h in section_headers]) + r')\s*:?\s*$'
-    matches = list(re.finditer(header_pattern, resume_text, flags=re.MULTILINE | re.IGNORECASE))
-
-    if not matches:
+    if not headers:
         return docs
 
-    # Iterate over matches to split sections
-    for i, match in enumerate(matches):
-        start_idx = match.end()
-        end_idx = matches[i+1].start() if i+1 < len(matches) else len(resume_text)
+    # Iterate over headers to split sections
+    for i, header in enumerate(headers):
+        start_idx = header.end
+        end_idx = headers[i+1].start if i+1 < len(headers) else len(resume_text)
 
-        section_name = match.group(1).lower()
-        section_content = resume_text[start_idx:end_idx].strip()
+        section_name = header.keyword.lower()
+        raw_content = resume_text[start_idx:end_idx]
+        section_content = raw_content.strip()
+        content_start = start_idx + len(raw_content) - len(raw_content.lstrip())
+        content_end = content_start + len(section_content)
 
         if section_content:
-            docs.extend(_chunk_section(section_content, section_name, metadata))
+            docs.extend(_chunk_section(
+                resume_text, section_name, content_start, content_end, entry_hits, page_offsets
+            ))
 
     return docs
 
-def _chunk_section(section_text: str, section_name: str, metadata: dict):
-    from langchain.schema import Document
-    import re
-
-    docs = []
+def _chunk_section(resume_text: str, section_name: str, start: int, end: int,
+                   entry_hits: list, page_offsets: list = None):
+    def doc(chunk_start, chunk_end, chunk_type):
+        raw = resume_text[chunk_start:chunk_end]
+        content = raw.strip()
+        chunk_start += len(raw) - len(raw.lstrip())
+        meta = {"section": section_name, "type": chunk_type,
+                "start": chunk_start, "end": chunk_start + len(content)}
+        if page_offsets:
+            meta["page"] = page_for_offset(page_offsets, chunk_start)
+        return Document(page_content=content, metadata=meta)
 
     # Macro chunk: entire section
-    docs.append(Document(
-        page_content=section_text.strip(),
-        metadata={"section": section_name, "type": "section"}
-    ))
-
-    items_key = None
-    if section_name.lower() in ["projects"]:
-        items_key = "projects"
-    elif section_name.lower() in ["experience", "professional experience"]:
-        items_key = "experience"
-    elif section_name.lower() in ["education"]:
-        items_key = "education"
-
-    if items_key and metadata.get(items_key):
-        entries = metadata[items_key]
-        if isinstance(entries, str):
-            entries = [e.strip() for e in entries.split(",") if e.strip()]
-
-        # Sort entries by length (longest first to avoid partial matches)
-        entries = sorted(entries, key=len, reverse=True)
-
-        # Build regex pattern to capture each entry and its following content
-        entry_pattern = r'(' + '|'.join(re.escape(e) for e in entries) + r')'
-        matches = list(re.finditer(entry_pattern, section_text, flags=re.IGNORECASE))
-
+    docs = [doc(start, end, "section")]
+
+    items_key = ITEM_SECTIONS.get(section_name.lower())
+    if items_key:
+        # Longest entry wins at each position, matches don't overlap
+        matches = leftmost_longest(
+            h for h in entry_hits if h.kind == items_key and h.start >= start and h.end <= end
+        )
         for i, match in enumerate(matches):
-            start = match.start()
-            end = matches[i+1].start() if i+1 < len(matches) else len(section_text)
-            chunk = section_text[start:end].strip()
-
-            docs.append(Document(
-                page_content=chunk,
-                metadata={"section": section_name, "type": "item"}
-            ))
+            item_end = matches[i+1].start if i+1 < len(matches) else end
+            docs.append(doc(match.start, item_end, "item"))
 
     return docs
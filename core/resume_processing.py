@@ -1,39 +1,144 @@
-import re
+import atexit
 import fitz
+import multiprocessing
 import os
-from docx import Document
+import threading
+import zipfile
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, NamedTuple, Tuple
+from xml.etree.ElementTree import iterparse
+from core.redaction import redact, redact_pages
+from app.config import MAX_RESUME_PAGES, MAX_RESUME_BYTES, PARALLEL_PDF_MIN_PAGES, PDF_PAGES_PER_WORKER
+
+class PageText(NamedTuple):
+    page: int   # 1-based page number
+    text: str
 
 def anonymize_resume(text: str) -> str:
-    text = re.sub(
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        'EMAIL_REDACTED', text
-    )
-    text = re.sub(
-        r'(\+?\d{1,3}[\s.-]?)?(\(?\d{3}\)?[\s.-]?)\d{3}\s*[\-.\s]\s*\d{4}',
-        'PHONE_REDACTED', text
-    )
-    text = re.sub(r'https?://\S+', 'URL_REDACTED', text)
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n+', '\n', text)
-    return text
+    return redact(text).text
 
-def extract_text_from_file(file_obj):
+def anonymize_pages(pages) -> Tuple[str, List[int]]:
+    """Anonymize page by page and return the joined text with each page's start offset."""
+    texts = [result.text for result in redact_pages(p.text for p in pages)]
+    return join_pages(texts)
+
+def join_pages(texts) -> Tuple[str, List[int]]:
+    """Join page texts, returning the full text and the start offset of every page."""
+    offsets, pos = [], 0
+    for t in texts:
+        offsets.append(pos)
+        pos += len(t)
+    return "".join(texts), offsets
+
+def page_for_offset(page_offsets: List[int], offset: int) -> int:
+    """1-based page containing a character offset of the joined text."""
+    return max(bisect_right(page_offsets, offset), 1)
+
+# --- Extraction ---
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+def _get_pdf_pool():
+    """
+    Process pool shared by all requests. The pool is created from request threads, so workers
+    are started by a forkserver (spawn where unavailable) rather than forking a multi-threaded process.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1), mp_context=multiprocessing.get_context(method)
+            )
+            atexit.register(_pdf_pool.shutdown, wait=False, cancel_futures=True)
+        return _pdf_pool
+
+def _extract_pdf_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Worker: text of pages [start, stop) of a PDF (runs in a separate process)."""
+    with fitz.open(file_path) as doc:
+        return [doc[i].get_text() + "\n" for i in range(start, stop)]
+
+def _iter_pdf_pages(file_path: str, max_pages: int, parallel: bool) -> Iterator[PageText]:
+    with fitz.open(file_path) as doc:
+        page_count = doc.page_count
+        if page_count > max_pages:
+            raise ValueError(f"PDF has {page_count} pages; the limit is {max_pages}.")
+        if not parallel or page_count < PARALLEL_PDF_MIN_PAGES:
+            for i, page in enumerate(doc):
+                yield PageText(i + 1, page.get_text() + "\n")
+            return
+
+    # Large PDF: spread page ranges across processes, yielding pages in order
+    pool = _get_pdf_pool()
+    futures = [
+        (start, pool.submit(_extract_pdf_range, file_path, start, min(start + PDF_PAGES_PER_WORKER, page_count)))
+        for start in range(0, page_count, PDF_PAGES_PER_WORKER)
+    ]
+    for start, future in futures:
+        for offset, text in enumerate(future.result()):
+            yield PageText(start + offset + 1, text)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def _iter_docx_pages(file_path: str, max_pages: int) -> Iterator[PageText]:
+    """
+    Stream paragraphs from word/document.xml without building the whole document tree.
+    DOCX has no fixed pages; explicit and last-rendered page breaks delimit them.
+    """
+    page, paragraphs, parts = 1, [], []
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+        for event, elem in iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                page_break = (
+                    tag == f"{_W}lastRenderedPageBreak"
+                    or (tag == f"{_W}br" and elem.get(f"{_W}type") == "page")
+                )
+                if page_break and (paragraphs or parts):
+                    paragraphs.append("".join(parts))
+                    parts = []
+                    yield PageText(page, "\n".join(paragraphs) + "\n")
+                    page, paragraphs = page + 1, []
+                    if page > max_pages:
+                        raise ValueError(f"DOCX has more than {max_pages} pages.")
+                continue
+            if tag == f"{_W}t":
+                parts.append(elem.text or "")
+            elif tag == f"{_W}tab":
+                parts.append("\t")
+            elif tag == f"{_W}br" and elem.get(f"{_W}type") != "page":
+                parts.append("\n")
+            elif tag == f"{_W}p":
+                paragraphs.append("".join(parts))
+                parts = []
+                elem.clear()
+    if paragraphs:
+        yield PageText(page, "\n".join(paragraphs) + "\n")
+
+def iter_pages(file_obj, max_pages: int = MAX_RESUME_PAGES, max_bytes: int = MAX_RESUME_BYTES,
+               parallel: bool = True) -> Iterator[PageText]:
+    """
+    Yield the document text page by page. Large PDFs are extracted across a process pool
+    by page ranges. Files over max_bytes or max_pages are rejected with ValueError.
+    """
     # Get the file path (Gradio gives a temp file path)
-    file_path = file_obj.name
+    file_path = getattr(file_obj, "name", file_obj)
 
-    ext = os.path.splitext(file_path)[1].lower()
+    size = os.path.getsize(file_path)
+    if size > max_bytes:
+        raise ValueError(f"File is {size / 1e6:.1f} MB; the limit is {max_bytes / 1e6:.1f} MB.")
 
+    ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
-        text = ""
-        with fitz.open(file_path) as doc:
-            for page in doc:
-                text += page.get_text() + "\n"
-        return text
-
+        return _iter_pdf_pages(file_path, max_pages, parallel)
     elif ext == ".docx":
-        doc = Document(file_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text
-
+        return _iter_docx_pages(file_path, max_pages)
     else:
-        raise ValueError("Unsupported file type. Only PDF and DOCX are supported.")
\ No newline at end of file
+        raise ValueError("Unsupported file type. Only PDF and DOCX are supported.")
+
+def extract_pages(file_obj) -> List[PageText]:
+    return list(iter_pages(file_obj))
+
+def extract_text_from_file(file_obj):
+    return "".join(page.text for page in iter_pages(file_obj))
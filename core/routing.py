@@ -1,24 +1,37 @@
-from langchain_openai import OpenAIEmbeddings
+import asyncio
+from core.vectorstore import similarity_search_with_scores
 
-def should_use_vectorstore(question: str, vector_db, threshold: float = 0.70, k: int = 3):
+def embed_question(question: str, vector_db):
+    """Embed the question once per turn with the store's (cached) embedding function."""
+    embedder = getattr(vector_db, "embeddings", None)
+    return embedder.embed_query(question) if embedder is not None else None
+
+async def aembed_question(question: str, vector_db):
+    """Async version of embed_question."""
+    embedder = getattr(vector_db, "embeddings", None)
+    return await embedder.aembed_query(question) if embedder is not None else None
+
+def should_use_vectorstore(question: str, vector_db, threshold: float = 0.70, k: int = 3, question_embedding=None):
     """
-    Quick heuristic: embed the question and check similarity against the top resume documents.
-    If any top doc has cosine similarity > threshold -> prefer VECTORSTORE.
+    Quick heuristic: compare the question embedding with the top resume documents.
+    If any top doc has cosine similarity >= threshold -> prefer VECTORSTORE.
     Returns True if VECTORSTORE preferred, False otherwise.
     """
     try:
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        q_emb = embeddings.embed_query(question)
-        docs = vector_db.similarity_search_by_vector(q_emb, k=k, include_metadata=True)
-        # Chroma doc similarity score access can differ; attempt to read similarity from metadata or fallback
-        for d in docs:
-            # doc.metadata might contain a '_similarity' key depending on impl
-            score = d.metadata.get("_similarity", None) if hasattr(d, "metadata") else None
-            # if no explicit score, we can compute approximate by re-embedding and cosine (expensive)
-            if score is not None:
-                if float(score) >= threshold:
-                    return True
-        # fallback: return False (conservative)
+        q_emb = question_embedding if question_embedding is not None else embed_question(question, vector_db)
+        if q_emb is None:
+            return False
+        for _, score in similarity_search_with_scores(vector_db, q_emb, k=k):
+            if score >= threshold:
+                return True
+        return False
+    except Exception:
         return False
+
+async def ashould_use_vectorstore(question: str, vector_db, threshold: float = 0.70, k: int = 3, question_embedding=None):
+    """Async version of should_use_vectorstore; the store lookup runs in a worker thread."""
+    try:
+        q_emb = question_embedding if question_embedding is not None else await aembed_question(question, vector_db)
     except Exception:
         return False
+    return await asyncio.to_thread(should_use_vectorstore, question, vector_db, threshold, k, q_emb)
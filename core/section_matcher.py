@@ -0,0 +1,145 @@
+# section_matcher.py
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple
+
+
+class Hit(NamedTuple):
+    start: int   # [start, end) in the scanned text
+    end: int
+    keyword: str
+    kind: str
+
+
+class KeywordAutomaton:
+    """
+    Case-insensitive Aho-Corasick automaton over a fixed set of (keyword, kind) pairs.
+    Transitions are precomputed (a DFA), so a scan is one dict lookup per character.
+    While no match is in progress, the scan jumps ahead to the next position where a
+    keyword can start, found by a compiled search over keyword prefixes.
+    """
+
+    def __init__(self, keywords: Iterable[tuple]):
+        self._delta: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[tuple]] = [[]]   # state -> [(keyword, kind, length)]
+        prefixes = set()
+
+        for keyword, kind in keywords:
+            lowered = keyword.lower()
+            if not lowered:
+                continue
+            prefixes.add(lowered[:2])
+            state = 0
+            for ch in lowered:
+                nxt = self._delta[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._delta)
+                    self._delta.append({})
+                    self._outputs.append([])
+                    self._delta[state][ch] = nxt
+                state = nxt
+            if all(out[:2] != (keyword, kind) for out in self._outputs[state]):
+                self._outputs[state].append((keyword, kind, len(lowered)))
+
+        self._build()
+        # Longest prefixes first so the alternation doesn't stop at a one-character keyword
+        self._start = re.compile("|".join(re.escape(p) for p in sorted(prefixes, key=len, reverse=True))) if prefixes else None
+
+    def _build(self):
+        # BFS over the trie: compute failure links, merge outputs, then fill in
+        # the missing transitions from each state's failure state.
+        fail = [0] * len(self._delta)
+        queue = deque(self._delta[0].values())
+        order = []
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, nxt in self._delta[state].items():
+                f = fail[state]
+                while f and ch not in self._delta[f]:
+                    f = fail[f]
+                fail[nxt] = self._delta[f].get(ch, 0)
+                self._outputs[nxt] = self._outputs[nxt] + self._outputs[fail[nxt]]
+                queue.append(nxt)
+        for state in order:
+            for ch, nxt in self._delta[fail[state]].items():
+                self._delta[state].setdefault(ch, nxt)
+
+    def __len__(self):
+        return len(self._delta)
+
+    def iter_hits(self, text: str):
+        """All (possibly overlapping) keyword occurrences, in order of their end offset."""
+        lowered = text.lower()
+        # Lower-casing can change the length of a few characters (e.g. "İ");
+        # fall back to per-character lowering so offsets stay aligned with text.
+        if len(lowered) != len(text):
+            lowered = [ch.lower()[:1] for ch in text]
+
+        if self._start is None:
+            return
+        # The prefix search needs a str; the per-character fallback scans every position
+        search = self._start.search if isinstance(lowered, str) else None
+        delta, outputs = self._delta, self._outputs
+        state, i, n = 0, 0, len(lowered)
+        while i < n:
+            if not state and search:
+                match = search(lowered, i)
+                if match is None:
+                    return
+                i = match.start()
+            state = delta[state].get(lowered[i], 0)
+            i += 1
+            for keyword, kind, length in outputs[state]:
+                yield Hit(i - length, i, keyword, kind)
+
+
+def leftmost_longest(hits: Iterable[Hit]) -> List[Hit]:
+    """Non-overlapping hits, preferring the earliest start and then the longest match."""
+    selected, pos = [], -1
+    for hit in sorted(hits, key=lambda h: (h.start, -(h.end - h.start))):
+        if hit.start >= pos:
+            selected.append(hit)
+            pos = hit.end
+    return selected
+
+
+class SectionMatcher:
+    """
+    Finds section headers and item entries (projects, roles, degrees) of one resume
+    in a single pass. Headers only count when they fill a line on their own,
+    optionally followed by a colon; entries match anywhere.
+    """
+
+    HEADER = "header"
+
+    def __init__(self, section_headers: Iterable[str], entries: Dict[str, Iterable[str]] = None):
+        keywords = [(h, self.HEADER) for h in section_headers if h.strip()]
+        for kind, values in (entries or {}).items():
+            keywords.extend((e, kind) for e in values if e.strip())
+        self.automaton = KeywordAutomaton(keywords)
+
+    def scan(self, text: str):
+        """
+        Return (headers, entry_hits): line-anchored header hits, extended to the end of
+        their line (past an optional colon), and all entry hits.
+        """
+        headers, entries = [], []
+        for hit in self.automaton.iter_hits(text):
+            if hit.kind != self.HEADER:
+                entries.append(hit)
+                continue
+            line_end = self._line_end_if_alone(text, hit)
+            if line_end is not None:
+                headers.append(hit._replace(end=line_end))
+        return leftmost_longest(headers), entries
+
+    @staticmethod
+    def _line_end_if_alone(text: str, hit: Hit):
+        line_start = text.rfind("\n", 0, hit.start) + 1
+        line_end = text.find("\n", hit.end)
+        if line_end == -1:
+            line_end = len(text)
+        before = text[line_start:hit.start]
+        after = text[hit.end:line_end].strip()
+        return line_end if not before.strip() and after in ("", ":") else None
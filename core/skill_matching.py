@@ -0,0 +1,117 @@
+# skill_matching.py
+import difflib
+import re
+from typing import List
+import numpy as np
+from core.metadata_extraction import _match_skills
+from core.skills_gazetteer import IMPLIED_BY, iter_entries
+
+_aliases = None     # normalized alias -> canonical name
+
+
+def _key(name: str) -> str:
+    return re.sub(r"[\s_\-]+", " ", name.strip().lower())
+
+
+def _alias_table() -> dict:
+    global _aliases
+    if _aliases is None:
+        _aliases = {_key(alias): name for alias, name, _ in iter_entries()}
+    return _aliases
+
+
+def normalize_skill(name: str, cutoff: float = 0.88) -> str:
+    """
+    Canonical gazetteer name for a skill string: exact alias first, then the closest alias
+    by edit similarity ("Postgre SQL", "Kubernets"). Unknown skills are returned stripped.
+    """
+    aliases = _alias_table()
+    key = _key(name)
+    if key in aliases:
+        return aliases[key]
+    # Short names are too ambiguous to fuzzy match ("Go" vs "Git")
+    if len(key) > 3:
+        close = difflib.get_close_matches(key, aliases.keys(), n=1, cutoff=cutoff)
+        if close:
+            return aliases[close[0]]
+    return name.strip()
+
+
+def normalize_skills(names) -> List[str]:
+    """Canonical names, de-duplicated, in first-seen order."""
+    return list(dict.fromkeys(normalize_skill(n) for n in names if n and n.strip()))
+
+
+def extract_skills(text: str) -> List[str]:
+    """Gazetteer skills mentioned in text (whole words, canonical names)."""
+    return _match_skills(text)[0]
+
+
+def mentions(text: str, skill: str) -> bool:
+    """Case-insensitive whole-word occurrence of skill in text, for skills outside the gazetteer."""
+    return re.search(rf"(?<![\w+#]){re.escape(skill)}(?![\w+#])", text or "", re.IGNORECASE) is not None
+
+
+class SkillMatrix:
+    """
+    Skill sets of many resumes as one boolean matrix (resumes x vocabulary), with the
+    ontology applied, so matching a JD against all of them is a single column selection.
+    """
+
+    def __init__(self, resume_skill_lists):
+        self.resume_skills = [normalize_skills(skills) for skills in resume_skill_lists]
+        self.vocabulary = {}
+        for skills in self.resume_skills:
+            for skill in skills:
+                self.vocabulary.setdefault(skill, len(self.vocabulary))
+        for parent in IMPLIED_BY:
+            self.vocabulary.setdefault(parent, len(self.vocabulary))
+
+        self.matrix = np.zeros((len(self.resume_skills), len(self.vocabulary)), dtype=bool)
+        for row, skills in enumerate(self.resume_skills):
+            self.matrix[row, [self.vocabulary[s] for s in skills]] = True
+        # A resume with PyTorch also covers "Deep Learning" and "Machine Learning" requirements
+        for parent, children in IMPLIED_BY.items():
+            columns = [self.vocabulary[c] for c in children if c in self.vocabulary]
+            if columns:
+                self.matrix[:, self.vocabulary[parent]] |= self.matrix[:, columns].any(axis=1)
+
+    def match(self, jd_skills):
+        """
+        (jd skills, matched matrix, coverage): matched[i, j] is True when resume i covers
+        jd skill j; coverage[i] is the fraction of JD skills resume i covers.
+        """
+        jd_skills = normalize_skills(jd_skills)
+        matched = np.zeros((len(self.resume_skills), len(jd_skills)), dtype=bool)
+        known = [j for j, skill in enumerate(jd_skills) if skill in self.vocabulary]
+        if known:
+            matched[:, known] = self.matrix[:, [self.vocabulary[jd_skills[j]] for j in known]]
+        coverage = matched.mean(axis=1) if jd_skills else np.zeros(len(self.resume_skills))
+        return jd_skills, matched, coverage
+
+
+def add_requirements(sets: dict, skills, resume_text: str) -> dict:
+    """
+    Extend a compare_skills() result with JD skills found elsewhere (e.g. by the LLM): each is
+    normalized, then matched against the resume's skills or, failing that, its text.
+    """
+    for skill in normalize_skills(skills):
+        if skill in sets["job_description_skills"]:
+            continue
+        sets["job_description_skills"].append(skill)
+        hit = skill in sets["resume_skills"] or mentions(resume_text, skill)
+        sets["matching_skills" if hit else "missing_skills"].append(skill)
+    return sets
+
+
+def compare_skills(resume_skills, jd_skills) -> dict:
+    """Deterministic resume/JD skill sets: resume, JD, matching and missing skills, plus coverage."""
+    matrix = SkillMatrix([resume_skills])
+    jd_skills, matched, coverage = matrix.match(jd_skills)
+    return {
+        "resume_skills": matrix.resume_skills[0],
+        "job_description_skills": jd_skills,
+        "matching_skills": [s for s, hit in zip(jd_skills, matched[0]) if hit],
+        "missing_skills": [s for s, hit in zip(jd_skills, matched[0]) if not hit],
+        "coverage": float(coverage[0]),
+    }
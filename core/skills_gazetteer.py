@@ -0,0 +1,78 @@
+# skills_gazetteer.py
+"""
+Known skills by category, used to extract skills/tech_stack/tags without an LLM.
+Each entry is "Canonical Name" or ("Canonical Name", [aliases...]).
+"""
+
+TECH_CATEGORIES = {
+    "languages": [
+        "Python", "Java", "JavaScript", ("TypeScript", ["TS"]), ("C++", ["cpp"]), ("C#", ["csharp"]),
+        ("Go", ["Golang"]), "Rust", "Kotlin", "Swift", "Scala", "Ruby", "PHP", "R", "C", "MATLAB",
+        "Perl", "Dart", "Elixir", "Haskell", "Lua", "Bash", "Shell", "PowerShell", "SQL", "HTML", "CSS",
+        "Objective-C", "Julia", "Solidity",
+    ],
+    "frontend": [
+        "React", ("React Native", []), ("Angular", ["AngularJS"]), ("Vue", ["Vue.js", "VueJS"]),
+        ("Next.js", ["NextJS"]), "Svelte", "Redux", "jQuery", "Tailwind", "Bootstrap", "Sass", "Webpack",
+        "Vite", "Flutter", "Gradio", "Streamlit",
+    ],
+    "backend": [
+        ("Node.js", ["NodeJS", "Node"]), "Express", "Django", "Flask", "FastAPI", ("Spring Boot", ["Spring"]),
+        ("ASP.NET", [".NET", "dotnet"]), "Rails", "Laravel", "GraphQL", ("REST", ["REST API", "RESTful"]),
+        "gRPC", "Microservices", "Celery", "RabbitMQ", "Kafka", "Nginx",
+    ],
+    "data": [
+        ("PostgreSQL", ["Postgres"]), "MySQL", "SQLite", ("MongoDB", ["Mongo"]), "Redis", "Cassandra",
+        "DynamoDB", "Elasticsearch", "Snowflake", "BigQuery", "Redshift", ("Apache Spark", ["Spark", "PySpark"]),
+        "Hadoop", "Airflow", "dbt", "Pandas", "NumPy", "Tableau", ("Power BI", ["PowerBI"]), "Excel", "ETL",
+        "Databricks",
+    ],
+    "ml": [
+        ("Machine Learning", ["ML"]), ("Deep Learning", []), ("Natural Language Processing", ["NLP"]),
+        ("Computer Vision", []), "TensorFlow", "PyTorch", "Keras", ("scikit-learn", ["sklearn"]), "XGBoost",
+        ("LLM", ["LLMs", "Large Language Models"]), "LangChain", "LangGraph", "Hugging Face", "OpenAI",
+        ("RAG", ["Retrieval-Augmented Generation"]), "MLOps", "OpenCV", "Transformers",
+    ],
+    "cloud": [
+        ("AWS", ["Amazon Web Services"]), ("GCP", ["Google Cloud"]), ("Azure", ["Microsoft Azure"]), "Lambda",
+        "EC2", "S3", "Heroku", "Firebase", "Vercel",
+    ],
+    "devops": [
+        "Docker", ("Kubernetes", ["K8s"]), "Terraform", "Ansible", "Jenkins", ("CI/CD", ["CICD"]),
+        ("GitHub Actions", []), "Git", "Linux", "Prometheus", "Grafana", "Helm",
+    ],
+    "testing": ["PyTest", "Jest", "Selenium", "Cypress", "JUnit", ("Unit Testing", [])],
+}
+
+# Non-technical skills: reported under skills, not tech_stack
+SOFT_SKILLS = [
+    "Leadership", "Communication", "Teamwork", "Problem Solving", "Project Management", "Agile", "Scrum",
+    "Mentoring", "Stakeholder Management", "Data Analysis", "System Design", "Product Management",
+]
+
+# Aliases that are ordinary words in lower case; they only count with this exact casing
+CASE_SENSITIVE = {"Go", "R", "C", "Express", "Spring", "Node", "Rails", "Lambda", "Excel", "Shell", "REST", "ML", "TS"}
+
+# Ontology: a requirement on the left is also satisfied by any of the skills on the right
+IMPLIED_BY = {
+    "Machine Learning": ["Deep Learning", "TensorFlow", "PyTorch", "Keras", "scikit-learn", "XGBoost"],
+    "Deep Learning": ["TensorFlow", "PyTorch", "Keras"],
+    "Natural Language Processing": ["Transformers", "Hugging Face", "LLM"],
+    "Computer Vision": ["OpenCV"],
+    "SQL": ["PostgreSQL", "MySQL", "SQLite", "BigQuery", "Snowflake", "Redshift"],
+    "JavaScript": ["TypeScript", "React", "Angular", "Vue", "Next.js", "Node.js", "Svelte"],
+    "REST": ["FastAPI", "Flask", "Django", "Express", "Spring Boot", "ASP.NET", "Rails"],
+    "CI/CD": ["GitHub Actions", "Jenkins"],
+    "Docker": ["Kubernetes"],
+    "Unit Testing": ["PyTest", "Jest", "JUnit"],
+    "Agile": ["Scrum"],
+}
+
+
+def iter_entries():
+    """Yield (alias, canonical name, category) for every gazetteer term."""
+    for category, entries in list(TECH_CATEGORIES.items()) + [("soft", SOFT_SKILLS)]:
+        for entry in entries:
+            name, aliases = entry if isinstance(entry, tuple) else (entry, [])
+            for alias in [name, *aliases]:
+                yield alias, name, category
@@ -1,32 +1,52 @@
 from langgraph.graph import END, StateGraph, START 
 from app.config import MODEL_NAME, TEMPERATURE
 from langchain.output_parsers import PydanticOutputParser
-from core.skills_graph.types import ResumeSuggestions, SkillsComparison, SkillsState
-from core.prompts import extract_skills_runnable, generate_suggestions_runnable
+from core.skills_graph.types import ResumeSuggestions, SkillsComparison, SkillsFitAnalysis, SkillsState
+from core.prompts import skills_fit_runnable, generate_suggestions_runnable
+from core.skill_matching import add_requirements, compare_skills, extract_skills
 
-skill_comp_parser = PydanticOutputParser(pydantic_object=SkillsComparison)
+fit_parser = PydanticOutputParser(pydantic_object=SkillsFitAnalysis)
 
 suggestions_parser = PydanticOutputParser(pydantic_object=ResumeSuggestions)
 
 # --- Functions ---
 def extract_and_compare(state):
-    response = extract_skills_runnable.invoke({
-        "resume_text": state["resume_text"],
-        "jd_text": state["job_description"],
-        "format_instructions": skill_comp_parser.get_format_instructions()
-    })
-
-    # extract string from AIMessage
-    if hasattr(response, "content"):
-        response_text = response.content
-    else:
-        response_text = response
+    """
+    Skill sets are computed locally (gazetteer + alias/fuzzy normalization + ontology). The LLM
+    scores the fit, writes the reasoning and ATS recommendations, and names JD skills the
+    gazetteer missed; those are normalized and matched against the resume locally as well.
+    """
+    jd_text = getattr(state["job_description"], "content", state["job_description"]) or ""
+    sets = compare_skills(extract_skills(state["resume_text"]), extract_skills(jd_text))
+    coverage = sets.pop("coverage")
 
     try:
-        return skill_comp_parser.parse(response_text)
+        response = skills_fit_runnable.invoke({
+            "resume_text": state["resume_text"],
+            "jd_text": state["job_description"],
+            "matching_skills": ", ".join(sets["matching_skills"]) or "none",
+            "missing_skills": ", ".join(sets["missing_skills"]) or "none",
+            "format_instructions": fit_parser.get_format_instructions()
+        })
+
+        # extract string from AIMessage
+        if hasattr(response, "content"):
+            response_text = response.content
+        else:
+            response_text = response
+
+        analysis = fit_parser.parse(response_text)
+        add_requirements(sets, analysis.other_job_description_skills, state["resume_text"])
     except Exception as e:
-        print("Error parsing skills:", e)
-        return SkillsComparison(matched_skills=[], missing_skills=[], extra_skills=[])
+        print("Error scoring skills fit:", e)
+        analysis = SkillsFitAnalysis(
+            ats_recommendations=[f"Mention {skill} if you have experience with it" for skill in sets["missing_skills"]],
+            fit_score=round(coverage * 100, 1),
+            fit_reasoning="Fit score is the share of recognized job description skills found in the resume; "
+                          "skills outside the skills dictionary were not compared.",
+        )
+
+    return SkillsComparison(**sets, **analysis.model_dump(exclude={"other_job_description_skills"}))
 
 def generate_resume_suggestions(resume_text, jd_text, skills_comparison):
     response = generate_suggestions_runnable.invoke({
@@ -49,13 +69,14 @@ def generate_resume_suggestions(resume_text, jd_text, skills_comparison):
 
 
 # --- Workflow ---
-def build_skills_flow(generate_suggestions=False):
+def build_skills_flow():
     """
-    StateGraph for skills comparison, optionally generating suggestions
+    StateGraph for skills comparison. Suggestions are generated when the call's config
+    sets {"configurable": {"generate_suggestions": True}}, so one compiled graph serves both uses.
     """
     workflow = StateGraph(SkillsState)
 
-    def run_skills(state):
+    def run_skills(state, config):
         skills_comparison = extract_and_compare(state)
         output = {
             "resume_text": state["resume_text"],
@@ -63,7 +84,7 @@ def build_skills_flow(generate_suggestions=False):
             "skills_comparison": skills_comparison
         }
 
-        if generate_suggestions:
+        if (config.get("configurable") or {}).get("generate_suggestions"):
             suggestions = generate_resume_suggestions(
                 state["resume_text"], state["job_description"], skills_comparison
             )
@@ -75,4 +96,7 @@ def build_skills_flow(generate_suggestions=False):
     workflow.add_edge(START, "compute_skills")
     workflow.add_edge("compute_skills", END)
 
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile()
+
+# Compiled once at import and shared by all sessions
+skills_flow = build_skills_flow()
@@ -1,5 +1,5 @@
 from typing_extensions import TypedDict
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List
 
 class SkillsState(TypedDict):
@@ -16,6 +16,15 @@ class SkillsComparison(BaseModel):
     fit_score: float
     fit_reasoning: str
 
+class SkillsFitAnalysis(BaseModel):
+    ats_recommendations: List[str]
+    fit_score: float
+    fit_reasoning: str
+    other_job_description_skills: List[str] = Field(
+        default_factory=list,
+        description="Skills the job description requires that are not in the matching or missing lists",
+    )
+
 class ResumeSuggestions(BaseModel):
     suggestions: List[str]
     sample_bullets: List[str]
\ No newline at end of file
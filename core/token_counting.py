@@ -0,0 +1,34 @@
+# token_counting.py
+import threading
+from app.config import MODEL_NAME
+
+_encoding = None
+_encoding_loaded = False
+_lock = threading.Lock()
+
+
+def _get_encoding():
+    """tiktoken encoding for the chat model, or None when it cannot be loaded (e.g. offline)."""
+    global _encoding, _encoding_loaded
+    with _lock:
+        if not _encoding_loaded:
+            _encoding_loaded = True
+            try:
+                import tiktoken
+                try:
+                    _encoding = tiktoken.encoding_for_model(MODEL_NAME)
+                except KeyError:
+                    _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                print(f"tiktoken unavailable, estimating tokens from length: {e}")
+        return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Number of model tokens in text (about 4 characters per token without tiktoken)."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
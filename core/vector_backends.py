@@ -0,0 +1,283 @@
+# vector_backends.py
+import os
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+
+def _matches(metadata: dict, where: dict) -> bool:
+    """Chroma-style metadata filter: {"key": value}, {"key": {"$in": [...]}}, {"key": {"$ne": value}}."""
+    for key, condition in where.items():
+        value = metadata.get(key)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$ne" in condition and value == condition["$ne"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    In-process vector store for small collections (one resume is tens of chunks).
+    Unit-normalized embeddings live in one contiguous matrix, so a query is a single
+    matrix-vector product; cosine similarity needs no index and nothing touches disk.
+    Searches score a snapshot of the matrix outside the lock; writes copy the matrix first
+    while a snapshot may still be in use (copy-on-write).
+    """
+
+    def __init__(self, embedding: Embeddings, name: str = "default", dtype=np.float32):
+        self.embedding = embedding
+        self.name = name
+        self.dtype = np.dtype(dtype)
+        self._matrix = np.empty((0, 0), dtype=self.dtype)
+        self._size = 0
+        self._ids: List[str] = []
+        self._docs: List[Document] = []
+        self._rows: Dict[str, int] = {}
+        self._shared = False   # a search may be reading the current matrix
+        self._lock = threading.RLock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def __len__(self):
+        return self._size
+
+    # --- Writes ---
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.add_embeddings(texts, self.embedding.embed_documents(texts), metadatas, ids)
+
+    def add_embeddings(self, texts: List[str], vectors, metadatas: Optional[List[dict]] = None,
+                       ids: Optional[List[str]] = None) -> List[str]:
+        """Add precomputed vectors; existing ids are overwritten (upsert)."""
+        metadatas = metadatas or [{} for _ in texts]
+        ids = list(ids) if ids else [uuid.uuid4().hex for _ in texts]
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = (vectors / np.where(norms == 0, 1, norms)).astype(self.dtype)
+
+        with self._lock:
+            self._reserve(self._size + len(texts), vectors.shape[1])
+            self._writable()
+            for doc_id, text, metadata, vector in zip(ids, texts, metadatas, vectors):
+                row = self._rows.get(doc_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._rows[doc_id] = row
+                    self._ids.append(doc_id)
+                    self._docs.append(None)
+                self._matrix[row] = vector
+                self._docs[row] = Document(page_content=text, metadata=dict(metadata or {}), id=doc_id)
+        return ids
+
+    def _reserve(self, rows: int, dim: int):
+        """Grow the matrix geometrically so repeated adds stay amortized O(1)."""
+        if self._matrix.shape[1] != dim and self._size:
+            raise ValueError(f"Embedding dimension {dim} does not match the store's {self._matrix.shape[1]}")
+        if rows <= self._matrix.shape[0] and self._matrix.shape[1] == dim:
+            return
+        grown = np.empty((max(rows, 2 * self._matrix.shape[0], 16), dim), dtype=self.dtype)
+        if self._size:
+            grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+        self._shared = False
+
+    def _writable(self):
+        """Copy the matrix before an in-place write if a search snapshot may still reference it."""
+        if self._shared:
+            self._matrix = self._matrix.copy()
+            self._shared = False
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Remove ids by moving the last row into each freed slot."""
+        with self._lock:
+            self._writable()
+            for doc_id in ids or []:
+                row = self._rows.pop(doc_id, None)
+                if row is None:
+                    continue
+                last = self._size - 1
+                if row != last:
+                    self._matrix[row] = self._matrix[last]
+                    self._ids[row] = self._ids[last]
+                    self._docs[row] = self._docs[last]
+                    self._rows[self._ids[row]] = row
+                self._ids.pop()
+                self._docs.pop()
+                self._size -= 1
+        return True
+
+    # --- Reads ---
+    def get_by_ids(self, ids) -> List[Document]:
+        with self._lock:
+            return [self._docs[self._rows[i]] for i in ids if i in self._rows]
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._ids)
+
+    def documents(self) -> List[Document]:
+        with self._lock:
+            return list(self._docs)
+
+    def similarity_search_with_similarity_by_vector(self, embedding: List[float], k: int = 4,
+                                                    filter: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        """(document, cosine similarity) pairs, best first."""
+        with self._lock:
+            if not self._size:
+                return []
+            # Rows and documents are taken together; later writes go to a copy of the matrix
+            matrix, docs = self._matrix[:self._size], list(self._docs)
+            self._shared = True
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = matrix.astype(np.float32, copy=False) @ (query / norm if norm else query)
+
+        if filter:
+            allowed = np.fromiter((_matches(d.metadata, filter) for d in docs), dtype=bool, count=len(docs))
+            scores = np.where(allowed, scores, -np.inf)
+            k = min(k, int(allowed.sum()))
+        k = min(k, len(docs))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(docs) else np.arange(len(docs))
+        top = top[np.argsort(-scores[top])]
+        return [(docs[i], float(scores[i])) for i in top]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, filter: Optional[dict] = None,
+                                    **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_similarity_by_vector(embedding, k, filter)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: Optional[dict] = None,
+                                     **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_similarity_by_vector(self.embedding.embed_query(query), k, filter)
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs: Any) -> List[Document]:
+        return self.similarity_search_by_vector(self.embedding.embed_query(query), k, filter)
+
+    def _select_relevance_score_fn(self):
+        # Scores are already cosine similarities
+        return lambda score: score
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None,
+                   ids: Optional[List[str]] = None, **kwargs: Any) -> "NumpyVectorStore":
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
+
+
+# --- Backends: how the registry creates, inspects and drops named collections ---
+
+class NumpyBackend:
+    """Collections held in process memory; they are rebuilt (from the embedding cache) after a restart."""
+
+    def __init__(self, embedding_function: Embeddings, dtype=np.float32):
+        self.embedding_function = embedding_function
+        self.dtype = dtype
+        self._stores: Dict[str, NumpyVectorStore] = {}
+        self._lock = threading.Lock()
+
+    def open(self, name: str) -> NumpyVectorStore:
+        with self._lock:
+            if name not in self._stores:
+                self._stores[name] = NumpyVectorStore(self.embedding_function, name=name, dtype=self.dtype)
+            return self._stores[name]
+
+    def list_collections(self) -> List[str]:
+        return list(self._stores)
+
+    def drop(self, name: str):
+        with self._lock:
+            self._stores.pop(name, None)
+
+    @staticmethod
+    def name(store) -> str:
+        return store.name
+
+    @staticmethod
+    def count(store) -> int:
+        return len(store)
+
+    @staticmethod
+    def ids(store) -> List[str]:
+        return store.ids()
+
+    @staticmethod
+    def delete_ids(store, ids):
+        store.delete(ids)
+
+    @staticmethod
+    def documents(store) -> List[Document]:
+        return store.documents()
+
+
+class ChromaBackend:
+    """Collections in one persistent Chroma store (HNSW, cosine space) for large corpora."""
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings):
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                import chromadb
+                os.makedirs(self.persist_directory, exist_ok=True)
+                self._client = chromadb.PersistentClient(path=self.persist_directory)
+            return self._client
+
+    def open(self, name: str):
+        from langchain_community.vectorstores import Chroma
+        return Chroma(
+            collection_name=name,
+            embedding_function=self.embedding_function,
+            client=self.client,
+            collection_metadata={"hnsw:space": "cosine"},
+        )
+
+    def list_collections(self) -> List[str]:
+        return [getattr(c, "name", c) for c in self.client.list_collections()]
+
+    def drop(self, name: str):
+        self.client.delete_collection(name)
+
+    @staticmethod
+    def name(store) -> str:
+        return store._collection.name
+
+    @staticmethod
+    def count(store) -> int:
+        return store._collection.count()
+
+    @staticmethod
+    def ids(store) -> List[str]:
+        return store._collection.get(include=[])["ids"]
+
+    @staticmethod
+    def delete_ids(store, ids):
+        store._collection.delete(ids=list(ids))
+
+    @staticmethod
+    def documents(store) -> List[Document]:
+        stored = store._collection.get(include=["documents", "metadatas"])
+        return [
+            Document(page_content=text, metadata=meta or {})
+            for text, meta in zip(stored["documents"], stored["metadatas"])
+        ]
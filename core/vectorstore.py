@@ -1,20 +1,47 @@
 # vectorstore.py
 import os
-import shutil
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
-from app.config import COLLECTION_NAME
+from app.config import (
+    COLLECTION_NAME, EMBEDDING_MODEL, EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_MB, VECTORSTORE_IDLE_TTL_S,
+    VECTOR_BACKEND, VECTOR_DTYPE,
+)
 from core.resume_chunking import chunk_resume
+from core.cache_store import SQLiteCacheStore
+from core.embedding_cache import CachedEmbeddings
+from core.vector_backends import ChromaBackend, NumpyBackend, NumpyVectorStore
+from core.vectorstore_registry import VectorStoreRegistry, resume_hash
 import uuid
 
 # Default directories
 DEFAULT_PERSIST_DIR = os.getenv("VECTORSTORE_PERSIST_DIR", "./resume_db")
 VECTORSTORE_DIR = "vectorstore/"
 
-# Embeddings
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+# Embeddings (cached on disk so re-uploads only embed changed chunks)
+embeddings = CachedEmbeddings(
+    OpenAIEmbeddings(model=EMBEDDING_MODEL),
+    model_name=EMBEDDING_MODEL,
+    store=SQLiteCacheStore(EMBEDDING_CACHE_PATH, table="embeddings", max_bytes=EMBEDDING_CACHE_MAX_MB * 1024 * 1024),
+)
+
+def _make_backend(kind: str):
+    if kind == "numpy":
+        return NumpyBackend(embeddings, dtype=VECTOR_DTYPE)
+    if kind == "chroma":
+        return ChromaBackend(DEFAULT_PERSIST_DIR, embeddings)
+    raise ValueError(f"Unknown VECTOR_BACKEND: {kind!r} (expected 'numpy' or 'chroma')")
+
+# One backend shared by all sessions; collections are keyed by resume content hash
+vector_backend = _make_backend(VECTOR_BACKEND)
+vectorstore_registry = VectorStoreRegistry(vector_backend, idle_ttl_seconds=VECTORSTORE_IDLE_TTL_S)
+
+# Large multi-resume corpora (bulk ingestion) always live in persistent Chroma
+corpus_backend = ChromaBackend(DEFAULT_PERSIST_DIR, embeddings)
+
+def open_corpus(collection_name: str = COLLECTION_NAME):
+    """Open a long-lived corpus collection; it is outside the per-resume registry and never evicted."""
+    return corpus_backend.open(collection_name)
 
 def save_docs_to_file(docs, filename="chunked_resume.txt"):
     with open(filename, "w", encoding="utf-8") as f:
@@ -33,38 +60,52 @@ def _fallback_text_split(resume_text: str, metadata: dict):
     documents = [Document(page_content=chunk, metadata={**metadata, "type":"chunk"}) for chunk in chunks]
     return documents
 
-def create_vectorstore(resume_text: str, metadata: dict, persist_directory: str = DEFAULT_PERSIST_DIR):
-    """
-    Creates a fresh vectorstore using chunk_resume, falls back to character splitter if needed.
-    Ensures previous vectorstore is completely removed.
-    Returns a persisted Chroma vectorstore.
-    """
-    # 0️⃣ Clear old vectorstore
-    if os.path.exists(persist_directory):
-        shutil.rmtree(persist_directory, ignore_errors=True)
-    os.makedirs(persist_directory, exist_ok=True)
-
+def _build_documents(resume_text: str, metadata: dict, page_offsets: list = None):
     # 1️⃣ Chunk resume
-    documents = chunk_resume(resume_text, metadata)
+    documents = chunk_resume(resume_text, metadata, page_offsets)
     if not documents:
         print("chunk_resume returned no docs — using fallback splitter")
         documents = _fallback_text_split(resume_text, metadata)
 
     # 2️⃣ Save chunks to file
     save_docs_to_file(documents, "my_chunked_resume.txt")
+    return documents
 
-    # 3️⃣ Use a unique collection name to prevent merging
-    collection_name = f"resume_{uuid.uuid4().hex}"
-
-    # 4️⃣ Create new vectorstore
-    vectorstore = Chroma.from_documents(
-        documents,
-        embeddings,
-        collection_name=collection_name,
-        persist_directory=persist_directory
+def create_vectorstore(resume_text: str, metadata: dict, session_id: str = None, page_offsets: list = None):
+    """
+    Returns the shared collection for this resume from the registry, chunking and
+    embedding it only if no session has indexed the same resume before.
+    Other sessions' collections are never touched.
+    """
+    session_id = session_id or uuid.uuid4().hex
+    vectorstore = vectorstore_registry.acquire(
+        session_id,
+        resume_hash(resume_text),
+        lambda: _build_documents(resume_text, metadata, page_offsets),
     )
-
-    # 5️⃣ Persist and confirm
-    vectorstore.persist()
-    print(f"✅ Vectorstore rebuilt successfully with {len(documents)} documents! Collection: {collection_name}")
+    print(f"✅ Vectorstore ready! Collection: {vector_backend.name(vectorstore)} | {vectorstore_registry.stats()}")
+    print(f"🧠 Embedding cache: {embeddings.stats}")
     return vectorstore
+
+def release_vectorstore(session_id: str):
+    """Release a session's reference so its collection can be evicted once idle."""
+    if session_id:
+        vectorstore_registry.release(session_id)
+
+def lexical_index(vector_db):
+    """BM25 index kept alongside a resume collection (None if the store has none)."""
+    try:
+        resume_key = vectorstore_registry.key_for(vector_db)
+    except AttributeError:
+        return None
+    return vectorstore_registry.lexical_index(resume_key) if resume_key else None
+
+def similarity_search_with_scores(vector_db, embedding, k: int = 4):
+    """
+    Return (document, cosine similarity) pairs for a query embedding.
+    Registry collections use the cosine space, so Chroma's distance is 1 - similarity.
+    """
+    if isinstance(vector_db, NumpyVectorStore):
+        return vector_db.similarity_search_with_similarity_by_vector(embedding, k=k)
+    results = vector_db.similarity_search_by_vector_with_relevance_scores(embedding, k=k)
+    return [(doc, 1.0 - float(distance)) for doc, distance in results]
@@ -0,0 +1,209 @@
+# vectorstore_registry.py
+import hashlib
+import threading
+import time
+from core.bm25 import BM25Index
+
+COLLECTION_PREFIX = "resume_"
+
+
+def resume_hash(resume_text: str) -> str:
+    """Content hash identifying a (normalized) resume across sessions."""
+    normalized = " ".join(resume_text.split())
+    # 128 bits keeps collection names inside Chroma's 63 character limit
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def _doc_id(doc) -> str:
+    meta = doc.metadata or {}
+    key = f"{meta.get('type', '')}\x00{meta.get('section', '')}\x00{doc.page_content}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class VectorStoreRegistry:
+    """
+    Maps resume content hashes to long-lived collections of a vector backend
+    (see core.vector_backends). Sessions acquire/release collections (reference counted);
+    unreferenced collections are dropped after idle_ttl_seconds, so one session's upload
+    never touches another's index.
+    """
+
+    def __init__(self, backend, idle_ttl_seconds: float = 3600):
+        self.backend = backend
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._loaded = False
+        self._entries = {}      # resume_hash -> {"collection_name", "vectorstore", "lexical_index", "sessions", "last_used"}
+        self._sessions = {}     # session_id -> resume_hash
+        self._build_locks = {}  # resume_hash -> Lock, so a resume is only indexed once at a time
+        self._lock = threading.RLock()
+
+    # --- Store access ---
+    def _load_existing(self):
+        """Register collections persisted by a previous process (once); they age out unless re-acquired."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            for name in self.backend.list_collections():
+                if name.startswith(COLLECTION_PREFIX):
+                    self._entries.setdefault(name[len(COLLECTION_PREFIX):], self._new_entry(name))
+
+    def _open(self, collection_name: str):
+        self._load_existing()
+        return self.backend.open(collection_name)
+
+    @staticmethod
+    def collection_name(resume_key: str) -> str:
+        return f"{COLLECTION_PREFIX}{resume_key}"
+
+    @staticmethod
+    def _new_entry(collection_name: str, vectorstore=None) -> dict:
+        return {
+            "collection_name": collection_name,
+            "vectorstore": vectorstore,
+            "lexical_index": None,
+            "sessions": set(),
+            "last_used": time.time(),
+        }
+
+    # --- Public API ---
+    def acquire(self, session_id: str, resume_key: str, build_documents):
+        """
+        Return the vectorstore for resume_key, indexing build_documents() only if the
+        collection does not exist yet. The session holds a reference until release().
+        """
+        with self._lock:
+            if self._sessions.get(session_id) not in (None, resume_key):
+                self.release(session_id)
+
+        while True:
+            build_lock = self._build_lock(resume_key)
+            with build_lock:
+                with self._lock:
+                    if self._build_locks.get(resume_key) is not build_lock:
+                        continue  # evicted while we waited; its lock is gone
+                    entry = self._entries.get(resume_key)
+                if entry is None or entry["vectorstore"] is None:
+                    vectorstore = self._open(self.collection_name(resume_key))
+                    if self.backend.count(vectorstore) == 0:
+                        self._upsert_documents(vectorstore, build_documents())
+                        print(f"✅ Indexed new resume collection: {self.collection_name(resume_key)}")
+                    else:
+                        print(f"♻️ Reusing resume collection: {self.collection_name(resume_key)}")
+                    with self._lock:
+                        entry = self._entries.setdefault(resume_key, self._new_entry(self.backend.name(vectorstore)))
+                        entry["vectorstore"] = vectorstore
+
+                # Still under the build lock, so eviction can't drop the entry before the session holds it
+                with self._lock:
+                    entry["sessions"].add(session_id)
+                    entry["last_used"] = time.time()
+                    self._sessions[session_id] = resume_key
+                vectorstore = entry["vectorstore"]
+            break
+
+        self.evict_idle()
+        return vectorstore
+
+    def release(self, session_id: str):
+        """Drop a session's reference; the collection stays until it has been idle long enough."""
+        with self._lock:
+            resume_key = self._sessions.pop(session_id, None)
+            entry = self._entries.get(resume_key)
+            if entry:
+                entry["sessions"].discard(session_id)
+                entry["last_used"] = time.time()
+
+    def upsert(self, resume_key: str, documents):
+        """Replace the documents stored for resume_key, embedding only new chunks."""
+        with self._lock:
+            entry = self._entries.get(resume_key)
+        vectorstore = entry["vectorstore"] if entry and entry["vectorstore"] else self._open(self.collection_name(resume_key))
+        self._upsert_documents(vectorstore, documents)
+        with self._lock:
+            entry = self._entries.setdefault(resume_key, self._new_entry(self.backend.name(vectorstore)))
+            entry["vectorstore"] = vectorstore
+            entry["lexical_index"] = None  # rebuilt from the new chunks on next use
+            entry["last_used"] = time.time()
+        return vectorstore
+
+    def lexical_index(self, resume_key: str):
+        """
+        BM25 index over the same chunks as resume_key's collection, built on first use
+        from the stored documents and kept for the lifetime of the entry.
+        """
+        with self._lock:
+            entry = self._entries.get(resume_key)
+        if entry is None or entry["vectorstore"] is None:
+            return None
+        index = entry["lexical_index"]
+        if index is None:
+            index = BM25Index(self.backend.documents(entry["vectorstore"]))
+            with self._lock:
+                entry["lexical_index"] = index
+        return index
+
+    def key_for(self, vectorstore):
+        """Resume key of a registry collection, or None for other collections."""
+        name = self.backend.name(vectorstore)
+        return name[len(COLLECTION_PREFIX):] if name.startswith(COLLECTION_PREFIX) else None
+
+    def delete(self, resume_key: str):
+        """Delete a resume's collection and detach any sessions still pointing at it."""
+        self._evict(resume_key)
+
+    def evict_idle(self, max_idle_seconds: float = None):
+        """Delete collections with no active sessions that have been idle past the TTL."""
+        ttl = self.idle_ttl_seconds if max_idle_seconds is None else max_idle_seconds
+        cutoff = time.time() - ttl
+        with self._lock:
+            candidates = [
+                key for key, entry in self._entries.items()
+                if not entry["sessions"] and entry["last_used"] < cutoff
+            ]
+        return [key for key in candidates if self._evict(key, cutoff)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "collections": len(self._entries),
+                "sessions": len(self._sessions),
+                "active_collections": sum(1 for e in self._entries.values() if e["sessions"]),
+            }
+
+    # --- Internals ---
+    def _build_lock(self, resume_key: str):
+        with self._lock:
+            return self._build_locks.setdefault(resume_key, threading.Lock())
+
+    def _evict(self, resume_key: str, cutoff: float = None) -> bool:
+        """
+        Drop resume_key's entry and collection. With a cutoff, only if the entry is still idle
+        once the build lock is held, so a concurrent acquire() or build is never cut off.
+        """
+        with self._build_lock(resume_key):
+            with self._lock:
+                entry = self._entries.get(resume_key)
+                if cutoff is not None and (entry is None or entry["sessions"] or entry["last_used"] >= cutoff):
+                    return False
+                self._entries.pop(resume_key, None)
+                for session_id in list(entry["sessions"]) if entry else []:
+                    self._sessions.pop(session_id, None)
+                self._build_locks.pop(resume_key, None)
+            if cutoff is not None:
+                print(f"🧹 Evicting idle collection: {self.collection_name(resume_key)}")
+            try:
+                self.backend.drop(self.collection_name(resume_key))
+            except Exception as e:
+                print(f"Could not delete collection for {resume_key}: {e}")
+        return True
+
+    def _upsert_documents(self, vectorstore, documents):
+        by_id = {_doc_id(d): d for d in documents}
+        existing = set(self.backend.ids(vectorstore))
+        stale = existing - set(by_id)
+        if stale:
+            self.backend.delete_ids(vectorstore, stale)
+        new_ids = [i for i in by_id if i not in existing]
+        if new_ids:
+            vectorstore.add_documents([by_id[i] for i in new_ids], ids=new_ids)
@@ -0,0 +1,152 @@
+# web_search.py
+import asyncio
+import json
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import List
+from core.cache_store import TTLCache
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: case, punctuation and spacing differences don't matter."""
+    return " ".join(re.sub(r"[^\w\s+#.]", " ", query.lower()).split()).strip(" .")
+
+
+class OfflineSearchTool:
+    """
+    Local stand-in for the web search tool, so the web path runs without network access.
+    Results come from a JSON file {normalized query: [{"url", "content"}, ...]} when given;
+    otherwise a single placeholder result is returned.
+    """
+
+    def __init__(self, path: str = None):
+        self.results = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.results = {normalize_query(q): r for q, r in json.load(f).items()}
+
+    def invoke(self, input, config=None, **kwargs) -> List[dict]:
+        query = input["query"] if isinstance(input, dict) else str(input)
+        found = self.results.get(normalize_query(query))
+        if found is not None:
+            return found
+        return [{"url": "offline://search", "content": f"No offline results stored for: {query}"}]
+
+    async def ainvoke(self, input, config=None, **kwargs) -> List[dict]:
+        return self.invoke(input, config, **kwargs)
+
+
+def tavily_search_tool(timeout_s: float):
+    """
+    TavilySearchResults whose HTTP requests time out after timeout_s. The stock wrapper posts
+    without a timeout, so a hung request would hold a CachedWebSearch worker indefinitely.
+    """
+    import requests
+    from langchain_community.tools.tavily_search import TavilySearchResults
+    from langchain_community.utilities.tavily_search import TAVILY_API_URL, TavilySearchAPIWrapper
+
+    class TimedTavilySearchAPIWrapper(TavilySearchAPIWrapper):
+        def raw_results(self, query: str, max_results: int = 5, search_depth: str = "advanced",
+                        include_domains=None, exclude_domains=None, include_answer: bool = False,
+                        include_raw_content: bool = False, include_images: bool = False) -> dict:
+            params = {
+                "api_key": self.tavily_api_key.get_secret_value(),
+                "query": query,
+                "max_results": max_results,
+                "search_depth": search_depth,
+                "include_domains": include_domains or [],
+                "exclude_domains": exclude_domains or [],
+                "include_answer": include_answer,
+                "include_raw_content": include_raw_content,
+                "include_images": include_images,
+            }
+            response = requests.post(f"{TAVILY_API_URL}/search", json=params, timeout=timeout_s)
+            response.raise_for_status()
+            return response.json()
+
+    return TavilySearchResults(api_wrapper=TimedTavilySearchAPIWrapper())
+
+
+class CachedWebSearch:
+    """
+    Web search tool wrapper with a TTL cache keyed by normalized query, single-flight
+    coalescing (concurrent identical queries share one request) and a hard timeout.
+    On timeout or error the caller gets [] instead of an exception; a request that
+    finishes after its timeout still fills the cache for the next asker. The wrapped tool
+    should enforce its own request timeout, since a hung request keeps its worker busy.
+    """
+
+    def __init__(self, tool, ttl_seconds: float = 3600, max_entries: int = 1000, timeout_s: float = 8.0,
+                 max_workers: int = 8):
+        self.tool = tool
+        self.timeout_s = timeout_s
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.counters = Counter()   # requests, coalesced, timeouts, errors
+        self._in_flight = {}        # normalized query -> Future
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-search")
+
+    def _fetch(self, key: str, query: str):
+        try:
+            results = self.tool.invoke({"query": query})
+            # Tavily reports some failures as a string instead of raising
+            if not isinstance(results, list):
+                raise ValueError(f"Unexpected search response: {str(results)[:200]}")
+            self.cache.put(key, results)
+            return results
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _future(self, query: str):
+        """(cached results, None) or (None, future of the shared in-flight request)."""
+        key = normalize_query(query)
+        # Looked up under the lock: _fetch fills the cache before leaving _in_flight, so a
+        # request finishing between a lookup and the in-flight check can't trigger a second one
+        with self._lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached, None
+            future = self._in_flight.get(key)
+            if future is None:
+                self.counters["requests"] += 1
+                future = self._in_flight[key] = self._pool.submit(self._fetch, key, query)
+            else:
+                self.counters["coalesced"] += 1
+        return None, future
+
+    def _degrade(self, query: str, error) -> List[dict]:
+        if isinstance(error, (FutureTimeout, asyncio.TimeoutError)):
+            self.counters["timeouts"] += 1
+            print(f"⏱️ Web search timed out after {self.timeout_s}s: {query!r}")
+        else:
+            self.counters["errors"] += 1
+            print(f"Web search failed: {error}")
+        return []
+
+    def invoke(self, input, config=None, **kwargs) -> List[dict]:
+        query = input["query"] if isinstance(input, dict) else str(input)
+        cached, future = self._future(query)
+        if future is None:
+            return cached
+        try:
+            return future.result(timeout=self.timeout_s)
+        except Exception as e:
+            return self._degrade(query, e)
+
+    async def ainvoke(self, input, config=None, **kwargs) -> List[dict]:
+        query = input["query"] if isinstance(input, dict) else str(input)
+        cached, future = self._future(query)
+        if future is None:
+            return cached
+        try:
+            # shield: a timed-out waiter must not cancel the request other callers share
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout_s)
+        except Exception as e:
+            return self._degrade(query, e)
+
+    def stats(self) -> dict:
+        return {**self.cache.stats.as_dict(), **self.counters, "entries": len(self.cache)}
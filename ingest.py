@@ -0,0 +1,25 @@
+# ingest.py
+import argparse
+from services.bulk_ingest_service import bulk_ingest
+from app.config import COLLECTION_NAME, BULK_EXTRACT_WORKERS, BULK_LLM_CONCURRENCY, BULK_EMBED_BATCH_SIZE
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory of PDF/DOCX resumes into the shared vector store.")
+    parser.add_argument("directory", help="Directory to scan (recursively) for resumes")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <directory>/.ingest_checkpoint.jsonl)")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--workers", type=int, default=BULK_EXTRACT_WORKERS, help="Extraction processes")
+    parser.add_argument("--llm-concurrency", type=int, default=BULK_LLM_CONCURRENCY, help="Concurrent metadata LLM calls")
+    parser.add_argument("--batch-size", type=int, default=BULK_EMBED_BATCH_SIZE, help="Chunks per embedding batch")
+    parser.add_argument("--limit", type=int, default=None, help="Only ingest the first N pending files")
+    args = parser.parse_args()
+
+    bulk_ingest(
+        args.directory,
+        checkpoint_path=args.checkpoint,
+        collection_name=args.collection,
+        extract_workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        batch_size=args.batch_size,
+        limit=args.limit,
+    )
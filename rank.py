@@ -0,0 +1,30 @@
+# rank.py
+import argparse
+import json
+from services.ranking_service import rank_candidates
+from app.config import COLLECTION_NAME, RANK_PREFILTER_K, RANK_TOP_N, RANK_LLM_CONCURRENCY
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank the ingested resumes against a job description.")
+    parser.add_argument("job_description", help="Text file containing the job description")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--top", type=int, default=RANK_TOP_N, help="Leaderboard size")
+    parser.add_argument("--prefilter", type=int, default=RANK_PREFILTER_K, help="Candidates sent to LLM fit scoring")
+    parser.add_argument("--concurrency", type=int, default=RANK_LLM_CONCURRENCY, help="Concurrent LLM calls")
+    parser.add_argument("--json", action="store_true", help="Print the final leaderboard as JSON")
+    args = parser.parse_args()
+
+    with open(args.job_description, encoding="utf-8") as f:
+        job_description = f.read()
+
+    leaderboard = []
+    for leaderboard in rank_candidates(job_description, top_n=args.top, prefilter_k=args.prefilter,
+                                       concurrency=args.concurrency, collection_name=args.collection):
+        best = leaderboard[0]
+        print(f"🏆 {len(leaderboard)} ranked | best: {best['source']} ({best['fit_score']:.1f})")
+
+    if args.json:
+        print(json.dumps(leaderboard, indent=2))
+    else:
+        for c in leaderboard:
+            print(f"{c['rank']:>3}. {c['fit_score']:5.1f}  sim={c['similarity']:.3f}  {c['source']}")
@@ -0,0 +1,259 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from app.config import COLLECTION_NAME, BULK_EXTRACT_WORKERS, BULK_LLM_CONCURRENCY, BULK_EMBED_BATCH_SIZE
+from core.resume_processing import iter_pages, anonymize_pages
+from core.metadata_extraction import extract_metadata, convert_metadata_for_chroma
+from core.resume_chunking import chunk_resume
+from core.vectorstore import embeddings, open_corpus
+from core.vectorstore_registry import resume_hash, _doc_id
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+
+def find_resumes(root: str):
+    """All PDF/DOCX files under root, in a stable order."""
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.join(dirpath, name))
+    return sorted(paths)
+
+
+def _prepare(path: str):
+    """Worker process: extract and anonymize one file. Returns (path, text, page_offsets, error)."""
+    try:
+        # Already running in a worker process, so pages are extracted sequentially
+        text, offsets = anonymize_pages(iter_pages(path, parallel=False))
+        return path, text, offsets, None
+    except Exception as e:
+        return path, None, None, f"{type(e).__name__}: {e}"
+
+
+def _chunk(path: str, text: str, offsets, key: str):
+    """LLM metadata extraction + chunking for one resume (runs on the LLM thread pool)."""
+    identity = {"resume_hash": key, "source": os.path.basename(path)}
+    metadata = convert_metadata_for_chroma(extract_metadata(text))
+    metadata.update(identity)
+    docs = chunk_resume(text, metadata, offsets)
+    # Section and item chunks only carry their own metadata; every chunk in the shared
+    # collection must be traceable to its candidate
+    for doc in docs:
+        doc.metadata.update(identity)
+    return docs
+
+
+class Checkpoint:
+    """
+    Append-only JSONL log of finished files. A file is only recorded once its chunks
+    are in the store, so a crashed run resumes from the first unrecorded file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = {}      # file path -> resume_hash
+        self.stored = set() # hashes whose chunks are in the store (duplicates excluded)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a crash
+                    if record.get("status") == "done":
+                        self._mark_done(record["path"], record.get("resume_hash"), record.get("duplicate", False))
+
+    def _mark_done(self, path: str, key: str, duplicate: bool):
+        self.done[path] = key
+        if not duplicate:
+            self.stored.add(key)
+
+    def record(self, path: str, status: str, **fields):
+        if status == "done":
+            self._mark_done(path, fields.get("resume_hash"), fields.get("duplicate", False))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"path": path, "status": status, "time": time.time(), **fields}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class _BatchWriter:
+    """
+    Buffers chunks from many resumes and embeds/writes them in batches. Files are only
+    checkpointed when the batch holding their chunks has been written; duplicates are
+    parked behind their original so they are never recorded before it.
+    """
+
+    def __init__(self, vectorstore, checkpoint: Checkpoint, batch_size: int):
+        self.vectorstore = vectorstore
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.docs, self.ids, self.pending = [], [], []   # pending: (path, resume_hash, n_chunks, duplicate)
+        self.buffered = set()                             # hashes of originals in pending
+        self.chunks_written = 0
+
+    def add(self, path: str, key: str, docs, duplicates=()):
+        """Buffer one resume (and files that duplicate it); returns True when a flush is due."""
+        for doc in docs:
+            self.docs.append(doc)
+            # Ids are scoped by resume so identical chunks of different resumes don't collide
+            self.ids.append(f"{key}-{_doc_id(doc)}")
+        self.pending.append((path, key, len(docs), False))
+        self.buffered.add(key)
+        for duplicate in duplicates:
+            self.add_duplicate(duplicate, key)
+        return len(self.docs) >= self.batch_size
+
+    def add_duplicate(self, path: str, key: str):
+        """A file whose content is already buffered: recorded in the same flush, after the original."""
+        self.pending.append((path, key, 0, True))
+
+    def flush(self) -> dict:
+        """
+        Write the buffered chunks and checkpoint their files. If the write fails, every file
+        of the batch is recorded as failed (to be retried by the next run) and the batch is dropped.
+        Returns counts of ingested, duplicate and failed files.
+        """
+        counts = {"ingested": 0, "duplicates": 0, "failed": 0}
+        pending, docs, ids = self.pending, self.docs, self.ids
+        self.docs, self.ids, self.pending, self.buffered = [], [], [], set()
+        try:
+            if docs:
+                # Dedupe ids within the batch; Chroma rejects duplicate ids in one upsert
+                by_id = dict(zip(ids, docs))
+                self.vectorstore.add_documents(list(by_id.values()), ids=list(by_id))
+                self.chunks_written += len(by_id)
+        except Exception as e:
+            print(f"❌ Batch write of {len(pending)} files failed: {e}")
+            for path, key, _, _ in pending:
+                self.checkpoint.record(path, "failed", resume_hash=key, error=f"{type(e).__name__}: {e}")
+            counts["failed"] = len(pending)
+            return counts
+
+        for path, key, n_chunks, duplicate in pending:
+            if duplicate:
+                self.checkpoint.record(path, "done", resume_hash=key, chunks=0, duplicate=True)
+                counts["duplicates"] += 1
+            else:
+                self.checkpoint.record(path, "done", resume_hash=key, chunks=n_chunks)
+                counts["ingested"] += 1
+        return counts
+
+
+def bulk_ingest(root: str, checkpoint_path: str = None, collection_name: str = COLLECTION_NAME,
+                extract_workers: int = BULK_EXTRACT_WORKERS, llm_concurrency: int = BULK_LLM_CONCURRENCY,
+                batch_size: int = BULK_EMBED_BATCH_SIZE, limit: int = None) -> dict:
+    """
+    Ingest every resume under root into one shared collection.
+
+        extract + anonymize (process pool) -> metadata + chunk (llm_concurrency threads)
+        -> batched embed + upsert (main thread) -> checkpoint
+
+    Files already in the checkpoint are skipped, as are duplicates of an ingested resume.
+    Returns run statistics including docs/sec.
+    """
+    checkpoint = Checkpoint(checkpoint_path or os.path.join(root, ".ingest_checkpoint.jsonl"))
+    paths = [p for p in find_resumes(root) if p not in checkpoint.done]
+    if limit:
+        paths = paths[:limit]
+    writer = _BatchWriter(open_corpus(collection_name), checkpoint, batch_size)
+    stats = {"files": len(paths), "ingested": 0, "skipped": len(checkpoint.done), "duplicates": 0, "failed": 0}
+    print(f"📂 {len(paths)} resumes to ingest ({stats['skipped']} already done) → collection '{collection_name}'")
+
+    start = time.perf_counter()
+    last_report = 0
+    in_flight = {}           # future -> (path, resume_hash)
+    waiting_duplicates = {}  # resume_hash still in flight -> [duplicate paths]
+
+    def fail(path, error):
+        print(f"❌ {path}: {error}")
+        checkpoint.record(path, "failed", error=error)
+        stats["failed"] += 1
+
+    def flush():
+        for name, count in writer.flush().items():
+            stats[name] += count
+
+    def drain(return_when):
+        done, _ = wait(in_flight, return_when=return_when)
+        for future in done:
+            path, key = in_flight.pop(future)
+            duplicates = waiting_duplicates.pop(key, [])
+            try:
+                docs = future.result()
+            except Exception as e:
+                # Duplicates are recorded failed too, so the next run retries them
+                for p in [path] + duplicates:
+                    fail(p, f"{type(e).__name__}: {e}")
+                continue
+            if writer.add(path, key, docs, duplicates):
+                flush()
+
+    def park_duplicate(path, key):
+        """
+        Record path as a duplicate once its original is checkpointed. False if there is no
+        original (never seen, or its write failed), in which case path is ingested itself.
+        """
+        if key in checkpoint.stored:
+            checkpoint.record(path, "done", resume_hash=key, chunks=0, duplicate=True)
+            stats["duplicates"] += 1
+        elif key in writer.buffered:
+            writer.add_duplicate(path, key)
+        elif any(k == key for _, k in in_flight.values()):
+            waiting_duplicates.setdefault(key, []).append(path)
+        else:
+            return False
+        return True
+
+    with ProcessPoolExecutor(max_workers=extract_workers) as extract_pool, \
+            ThreadPoolExecutor(max_workers=llm_concurrency, thread_name_prefix="bulk-llm") as llm_pool:
+        # Extraction is submitted in a bounded window, so texts can't pile up behind the LLM stage
+        extracting = deque()
+        queued = iter(paths)
+        for path in queued:
+            extracting.append(extract_pool.submit(_prepare, path))
+            if len(extracting) >= extract_workers * 2:
+                break
+
+        while extracting:
+            path, text, offsets, error = extracting.popleft().result()
+            next_path = next(queued, None)
+            if next_path is not None:
+                extracting.append(extract_pool.submit(_prepare, next_path))
+
+            if error:
+                fail(path, error)
+                continue
+
+            key = resume_hash(text)
+            if park_duplicate(path, key):
+                continue
+
+            # Keep a bounded number of LLM calls in flight; extraction keeps running meanwhile
+            while len(in_flight) >= llm_concurrency * 2:
+                drain(FIRST_COMPLETED)
+            in_flight[llm_pool.submit(_chunk, path, text, offsets, key)] = (path, key)
+
+            done_count = stats["ingested"] + stats["duplicates"] + stats["failed"]
+            if done_count - last_report >= 100:
+                last_report = done_count
+                elapsed = time.perf_counter() - start
+                print(f"⏱️ {done_count}/{len(paths)} files, {done_count / elapsed:.1f} docs/sec")
+
+        while in_flight:
+            drain(FIRST_COMPLETED)
+    flush()
+
+    elapsed = time.perf_counter() - start
+    stats.update({
+        "chunks": writer.chunks_written,
+        "seconds": round(elapsed, 2),
+        "docs_per_sec": round(stats["ingested"] / elapsed, 2) if elapsed else 0.0,
+        "chunks_per_sec": round(writer.chunks_written / elapsed, 2) if elapsed else 0.0,
+    })
+    print(f"✅ Bulk ingestion finished: {stats}")
+    print(f"🧠 Embedding cache: {embeddings.stats}")
+    return stats
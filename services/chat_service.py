@@ -1,42 +1,103 @@
-import time
 from langsmith.run_helpers import traceable
 import gradio as gr
+from core.answer_cache import SemanticAnswerCache, cache_namespace, refers_back
+from core.vectorstore import embeddings
+from core.prompts import ANSWER_STREAM_TAG
+from core.graph.workflow import chat_workflow, workflow_config
+from core.chat_history import session_memory
+from app.config import (
+    ANSWER_CACHE_ENABLED, ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_TTL_S, ANSWER_CACHE_MAX_ENTRIES
+)
+
+answer_cache = SemanticAnswerCache(
+    threshold=ANSWER_CACHE_THRESHOLD,
+    ttl_seconds=ANSWER_CACHE_TTL_S,
+    max_entries=ANSWER_CACHE_MAX_ENTRIES,
+)
+
+def answer_cache_stats():
+    """Hit/miss counters of the semantic answer cache, for monitoring."""
+    return {**answer_cache.stats.as_dict(), "entries": len(answer_cache)}
+
+def _answer_namespace(app_state, jd_text, message, memory):
+    """
+    Answer cache namespace of this turn, or None when the cache is skipped: disabled, or a
+    follow-up that refers back to earlier turns, whose answer depends on the conversation.
+    """
+    if not ANSWER_CACHE_ENABLED or (len(memory) and refers_back(message)):
+        return None
+    return cache_namespace(app_state.get("resume_hash"), getattr(jd_text, "content", jd_text))
+
+def _lookup_cached_answer(namespace, question_embedding):
+    """Cached answer for a question embedding in namespace, or None. The embedding is reused by the workflow."""
+    if namespace is None or question_embedding is None:
+        return None
+    cached = answer_cache.lookup(namespace, question_embedding)
+    if cached is not None:
+        print(f"⚡ Answer cache hit | {answer_cache_stats()}")
+    return cached
+
+def _store_answer(namespace, message, question_embedding, answer):
+    if namespace is None or not answer or answer.startswith("⚠️"):
+        return
+    answer_cache.store(namespace, message, question_embedding, answer)
 
 @traceable(name="RAG-Chat-Interaction")
 def chat_fn(message, history, app_state, metadata_state, jd_state):
     """Non-streaming fallback chat function."""
     history = history or []
-    if not app_state or "workflow" not in app_state:
+    if not app_state or "vector_db" not in app_state:
         return [{"role": "assistant", "content": "⚠️ Please upload a resume first."}]
 
+    jd_text = jd_state or app_state.get("job_description", "")
+    memory = session_memory(app_state)
+    summary, recent = memory.window()
+
+    namespace = _answer_namespace(app_state, jd_text, message, memory)
+    question_embedding = None
+    if namespace is not None:
+        try:
+            question_embedding = embeddings.embed_query(message)
+        except Exception as e:
+            print(f"Answer cache lookup skipped: {e}")
+    cached = _lookup_cached_answer(namespace, question_embedding)
     inputs = {
         "question": message,
         "metadata_summary": str(metadata_state) if metadata_state else "",
-        "job_description": jd_state or app_state.get("job_description", ""),
+        "job_description": jd_text,
         "documents": app_state.get("documents", []),
-        "chat_history": history[-8:],  # recent history
+        "chat_history": recent,  # token-budgeted recent turns
+        "history_summary": summary,
+        "question_embedding": question_embedding,
     }
 
-    workflow = app_state["workflow"]
     final_answer = "⚠️ No response generated."
 
-    for output in workflow.stream(inputs):
-        for _, value in output.items():
-            if "generation" in value:
-                gen = value["generation"]
-                final_answer = getattr(gen, "content", str(gen))
+    if cached is not None:
+        final_answer = cached
+    else:
+        for output in chat_workflow.stream(inputs, workflow_config(app_state["vector_db"])):
+            for _, value in output.items():
+                if "generation" in value:
+                    gen = value["generation"]
+                    final_answer = getattr(gen, "content", str(gen))
+        _store_answer(namespace, message, question_embedding, final_answer)
 
     history.append({"role": "user", "content": message})
     history.append({"role": "assistant", "content": final_answer})
+    memory.add_turn(message, final_answer)
+    memory.compact()
     return history
 
-def chat_stream(message, history, app_state, metadata_state, jd_state, user_input, send_btn):
+async def chat_stream(message, history, app_state, metadata_state, jd_state, user_input, send_btn):
+    """Async chat handler: the workflow runs on the event loop via astream, not on a worker thread."""
     history = history or []
 
     # Step 1: Append user message and disable input + button
     user_msg = {"role": "user", "content": message}
     history.append(user_msg)
-    app_state.setdefault("chat_history", []).append(user_msg)
+    # The turn is only recorded with its answer, so a failed or abandoned request leaves no dangling question
+    memory = session_memory(app_state)
     yield history, gr.update(interactive=False), gr.update(interactive=False, value="Send")
 
     # Step 2: Assistant placeholder
@@ -44,33 +105,72 @@ def chat_stream(message, history, app_state, metadata_state, jd_state, user_inpu
     history.append(assistant_msg)
     yield history, None, gr.update(interactive=False, value="Send")
 
-    # Step 3: Stream workflow response
+    vector_db = app_state.get("vector_db")
+    if vector_db is None:
+        history[-1]["content"] = "⚠️ Workflow not initialized."
+        yield history, None, gr.update(interactive=False, value="Send")
+        return
+
+    # Step 3: Answer from the semantic cache when the question was already asked
+    jd_text = jd_state or app_state.get("job_description", "")
+    summary, recent = memory.window()
+    namespace = _answer_namespace(app_state, jd_text, message, memory)
+    question_embedding = None
+    if namespace is not None:
+        try:
+            question_embedding = await embeddings.aembed_query(message)
+        except Exception as e:
+            print(f"Answer cache lookup skipped: {e}")
+    cached = _lookup_cached_answer(namespace, question_embedding)
+    if cached is not None:
+        history[-1]["content"] = cached
+        memory.add_turn(message, cached)
+        memory.compact_in_background()
+        yield history, gr.update(interactive=True), gr.update(interactive=True, value="Send")
+        return
+
+    # Step 4: Stream workflow response
     workflow_state = {
         "question": message,    
         "metadata_summary": str(metadata_state or ""),
-        "job_description": jd_state or app_state.get("job_description", ""),
+        "job_description": jd_text,
         "documents": app_state.get("documents", []),
-        "chat_history": app_state["chat_history"],
+        "chat_history": recent,
+        "history_summary": summary,
         "app_state": app_state,
+        "question_embedding": question_embedding,
     }
 
+    # Answer tokens stream straight from the LLM ("messages" mode); node updates carry the
+    # authoritative final generation, which only arrives after grading has finished.
     final_text = ""
-    workflow = app_state.get("workflow")
-    if not workflow:
-        history[-1]["content"] = "⚠️ Workflow not initialized."
+    answer_run_id = None
+    async for mode, payload in chat_workflow.astream(
+        workflow_state, workflow_config(vector_db), stream_mode=["messages", "updates"]
+    ):
+        if mode == "messages":
+            chunk, chunk_meta = payload
+            if ANSWER_STREAM_TAG not in (chunk_meta.get("tags") or []) or not chunk.content:
+                continue
+            # A new answer run (e.g. regeneration after grading) replaces the previous text
+            if chunk.id != answer_run_id:
+                answer_run_id, final_text = chunk.id, ""
+            final_text += chunk.content
+        else:
+            generations = [
+                value["generation"] for value in payload.values()
+                if isinstance(value, dict) and "generation" in value
+            ]
+            if not generations:
+                continue
+            final_text = getattr(generations[-1], "content", str(generations[-1]))
+        history[-1]["content"] = final_text
         yield history, None, gr.update(interactive=False, value="Send")
-        return
-
-    for output in workflow.stream(workflow_state):
-        for _, value in output.items():
-            if "generation" in value:
-                token = getattr(value["generation"], "content", str(value["generation"]))
-                final_text += token
-                history[-1]["content"] = final_text
-                yield history, None, gr.update(interactive=False, value="Send")
-                time.sleep(0.02)
 
-    # Step 4: finalize assistant response and re-enable input + button
+    # Step 5: finalize assistant response and re-enable input + button
     history[-1]["content"] = final_text
-    app_state["chat_history"].append({"role": "assistant", "content": final_text})
+    memory.add_turn(message, final_text)
+    _store_answer(namespace, message, question_embedding, final_text)
+    # Fold turns that left the window into the summary without holding up the answer
+    memory.compact_in_background()
     yield history, gr.update(interactive=True), gr.update(interactive=True, value="Send")
@@ -0,0 +1,87 @@
+import uuid
+from core.pipeline import Stage, run_stages
+from core.resume_processing import extract_pages, anonymize_pages
+from core.metadata_extraction import extract_metadata, convert_metadata_for_chroma
+from core.vectorstore import create_vectorstore
+from core.vectorstore_registry import resume_hash
+from core.prompts import llm
+from services.summarize_service import summarize_job_description
+from services.skills_service import skills_fit_fn, format_skill_chips, prefetch_suggestions
+from app.config import PREFETCH_SUGGESTIONS
+
+def ingestion_stages(file_obj, job_description, session_id, with_skills=True):
+    """
+    Ingestion as a dependency graph:
+
+        extract -> anonymize -> metadata -> vectorstore
+                            \\-------------------------> skills
+        jd_summary ----------------------------------/
+
+    JD summarization depends only on the JD, so it overlaps with resume processing,
+    and it runs once for both the chat state and the skills comparison.
+    """
+    has_jd = bool(job_description and job_description.strip())
+
+    stages = [
+        Stage("extract", lambda ctx: extract_pages(file_obj)),
+        # (text, page_offsets): anonymized page by page so chunks can be attributed to pages
+        Stage("anonymize", lambda ctx: anonymize_pages(ctx["extract"]), deps=["extract"]),
+        Stage("metadata", lambda ctx: convert_metadata_for_chroma(extract_metadata(ctx["anonymize"][0])), deps=["anonymize"]),
+        Stage(
+            "vectorstore",
+            lambda ctx: create_vectorstore(
+                ctx["anonymize"][0], ctx["metadata"], session_id=session_id, page_offsets=ctx["anonymize"][1]
+            ),
+            deps=["anonymize", "metadata"],
+        ),
+        Stage("jd_summary", lambda ctx: summarize_job_description(job_description, llm) if has_jd else ""),
+    ]
+    if with_skills and has_jd:
+        stages.append(Stage(
+            "skills",
+            lambda ctx: skills_fit_fn({"resume_text": ctx["anonymize"][0]}, None, ctx["jd_summary"]),
+            deps=["anonymize", "jd_summary"],
+        ))
+    return stages
+
+def run_ingestion(file_obj, job_description, app_state=None, with_skills=True):
+    """
+    Process a resume (and optional JD) with independent stages running concurrently.
+    Returns (app_state, metadata_dict, jd_summary, skills_comparison or None).
+    """
+    # Reuse the caller's session so re-uploads release the previous resume
+    if app_state is None or not isinstance(app_state, dict):
+        app_state = {}
+    session_id = app_state.get("session_id") or uuid.uuid4().hex
+
+    timings = {}
+    ctx = run_stages(ingestion_stages(file_obj, job_description, session_id, with_skills), timings=timings)
+    print("⏱️ Ingestion stages: " + ", ".join(f"{name}={secs:.2f}s" for name, secs in timings.items()))
+
+    safe_text, _ = ctx["anonymize"]
+    jd_summary = ctx["jd_summary"]
+    app_state.update({
+        "session_id": session_id,      # registry reference for this session
+        "resume_hash": resume_hash(safe_text),
+        "vector_db": ctx["vectorstore"],  # bound to the shared chat workflow per request
+        "resume_text": safe_text,      # for skills comparison
+        "job_description": jd_summary,  # optional summary
+    })
+    return app_state, ctx["metadata"], jd_summary, ctx.get("skills")
+
+def process_resume_job(resume_file, job_desc_text, app_state=None):
+    """Gradio entry point: status, states and skills outputs from a single ingestion run."""
+    if resume_file is None:
+        return "⚠️ Please upload a resume file.", None, None, "", "", "", []
+
+    app_state, metadata_dict, jd_summary, skills_comparison = run_ingestion(resume_file, job_desc_text, app_state)
+
+    if skills_comparison is not None:
+        fit_summary, skills_html, ats_recs = format_skill_chips(skills_comparison)
+        # Suggestions are not needed to render the chips; compute them off the request path
+        if PREFETCH_SUGGESTIONS:
+            prefetch_suggestions(app_state, jd_summary)
+    else:
+        fit_summary, skills_html, ats_recs = "", "", []
+
+    return "✅ Resume processed!", app_state, metadata_dict, jd_summary, fit_summary, skills_html, ats_recs
@@ -0,0 +1,85 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from app.config import COLLECTION_NAME, RANK_PREFILTER_K, RANK_TOP_N, RANK_LLM_CONCURRENCY
+from core.vector_backends import NumpyVectorStore
+from core.vectorstore import embeddings, open_corpus
+from services.skills_service import skills_fit_fn
+
+# collection name -> (stored document count, NumpyVectorStore of full-resume embeddings)
+_corpus_cache = {}
+_corpus_lock = threading.Lock()
+
+
+def load_candidate_pool(collection_name: str = COLLECTION_NAME) -> NumpyVectorStore:
+    """
+    One row per stored resume (its full_resume chunk) in an in-memory matrix, so the JD
+    prefilter is a single matrix-vector product. Rebuilt only when the corpus changes.
+    """
+    corpus = open_corpus(collection_name)
+    count = corpus._collection.count()
+    with _corpus_lock:
+        cached = _corpus_cache.get(collection_name)
+        if cached and cached[0] == count:
+            return cached[1]
+
+        stored = corpus._collection.get(
+            where={"type": "full_resume"}, include=["embeddings", "documents", "metadatas"]
+        )
+        pool = NumpyVectorStore(embeddings, name=collection_name)
+        if stored["ids"]:
+            pool.add_embeddings(stored["documents"], stored["embeddings"], stored["metadatas"], stored["ids"])
+        _corpus_cache[collection_name] = (count, pool)
+        print(f"📚 Candidate pool '{collection_name}': {len(pool)} resumes")
+        return pool
+
+
+def prefilter(job_description: str, k: int = RANK_PREFILTER_K, collection_name: str = COLLECTION_NAME):
+    """(full resume document, cosine similarity to the JD) for the k closest resumes."""
+    pool = load_candidate_pool(collection_name)
+    return pool.similarity_search_with_similarity_by_vector(embeddings.embed_query(job_description), k=k)
+
+
+def _score(doc, similarity, job_description):
+    comparison = skills_fit_fn({"resume_text": doc.page_content}, None, job_description)
+    return {
+        "source": doc.metadata.get("source", ""),
+        "resume_hash": doc.metadata.get("resume_hash", ""),
+        "fit_score": comparison.fit_score,
+        "similarity": round(similarity, 4),
+        "fit_reasoning": comparison.fit_reasoning,
+        "matching_skills": comparison.matching_skills,
+        "missing_skills": comparison.missing_skills,
+    }
+
+
+def rank_candidates(job_description: str, top_n: int = RANK_TOP_N, prefilter_k: int = RANK_PREFILTER_K,
+                    concurrency: int = RANK_LLM_CONCURRENCY, collection_name: str = COLLECTION_NAME):
+    """
+    Rank the stored candidate pool against one JD.
+
+        embedding prefilter (all resumes, vectorized) -> LLM fit score (top prefilter_k, bounded pool)
+
+    Yields the leaderboard (best fit_score first, at most top_n entries) every time another
+    candidate has been scored, so callers can display results while scoring continues.
+    """
+    if not job_description or not job_description.strip():
+        raise ValueError("A job description is required for ranking")
+
+    start = time.perf_counter()
+    shortlist = prefilter(job_description, k=max(prefilter_k, top_n), collection_name=collection_name)
+    print(f"🔎 Prefiltered {len(shortlist)} candidates in {time.perf_counter() - start:.2f}s")
+
+    scored = []
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="rank-llm") as pool:
+        futures = {pool.submit(_score, doc, similarity, job_description): doc for doc, similarity in shortlist}
+        for future in as_completed(futures):
+            try:
+                scored.append(future.result())
+            except Exception as e:
+                print(f"❌ Fit scoring failed for {futures[future].metadata.get('source', '?')}: {e}")
+                continue
+            scored.sort(key=lambda c: (c["fit_score"], c["similarity"]), reverse=True)
+            yield [{"rank": i, **c} for i, c in enumerate(scored[:top_n], 1)]
+
+    print(f"✅ Ranked {len(scored)}/{len(shortlist)} candidates in {time.perf_counter() - start:.2f}s")
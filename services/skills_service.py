@@ -1,12 +1,27 @@
-from core.skills_graph.skills_workflows import build_skills_flow
+from concurrent.futures import ThreadPoolExecutor
+from core.skills_graph.skills_workflows import skills_flow, generate_resume_suggestions
 from core.skills_graph.skills_workflows import SkillsComparison 
+from core.skills_graph.types import ResumeSuggestions
+from core.answer_cache import cache_namespace
+from core.cache_store import TTLCache
+from core.vectorstore_registry import resume_hash
 from langchain.output_parsers import PydanticOutputParser
+from app.config import SKILLS_CACHE_TTL_S, SKILLS_CACHE_MAX_ENTRIES
+
+# Results keyed by (resume hash, JD hash): the same resume and JD never hit the LLM twice
+skills_cache = TTLCache(max_entries=SKILLS_CACHE_MAX_ENTRIES, ttl_seconds=SKILLS_CACHE_TTL_S)
+# Suggestions are stored as Futures, so a background prefetch and an on-demand request share one LLM call
+suggestions_cache = TTLCache(max_entries=SKILLS_CACHE_MAX_ENTRIES, ttl_seconds=SKILLS_CACHE_TTL_S)
+
+_suggestions_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="resume-suggestions")
+
+def _cache_key(resume_str, jd_state):
+    return cache_namespace(resume_hash(resume_str), getattr(jd_state, "content", jd_state) or "")
 
 def skills_fit_fn(state, metadata_state, jd_state):
-    """Analyze resume vs job description and return skill comparison with ATS suggestions."""
+    """Analyze resume vs job description and return the skill comparison (suggestions are computed separately)."""
 
     resume_str = state.get("resume_text", "")
-    workflow = state.get("workflow")  # keep workflow for other logic if needed
 
     if not resume_str:
         return SkillsComparison(
@@ -17,27 +32,70 @@ def skills_fit_fn(state, metadata_state, jd_state):
             ats_recommendations=[]
         )
 
-    # Build skills workflow
-    skills_workflow = build_skills_flow(generate_suggestions=True)
-    result = skills_workflow.invoke({
-        "resume_text": resume_str,
-        "job_description": jd_state or ""
-    })
+    key = _cache_key(resume_str, jd_state)
+    cached = skills_cache.get(key)
+    if cached is not None:
+        print(f"⚡ Skills comparison cache hit | {skills_cache.stats}")
+        return cached
+
+    result = skills_flow.invoke({"resume_text": resume_str, "job_description": jd_state or ""})
 
     skills_data = result.get("skills_comparison", result)
 
     if isinstance(skills_data, SkillsComparison):
-        return skills_data
+        comparison = skills_data
     elif isinstance(skills_data, dict):
-        return SkillsComparison(**skills_data)
+        comparison = SkillsComparison(**skills_data)
     else:
         raise TypeError(f"Unexpected type for skills_data: {type(skills_data)}")
 
+    skills_cache.put(key, comparison)
+    return comparison
+
+
+def _generate_suggestions(resume_str, jd_state):
+    # The comparison is normally cached already: the chips were rendered from it
+    comparison = skills_fit_fn({"resume_text": resume_str}, None, jd_state)
+    return generate_resume_suggestions(resume_str, jd_state or "", comparison)
+
+
+def _suggestions_future(resume_str, jd_state):
+    key = _cache_key(resume_str, jd_state)
+    future = suggestions_cache.setdefault(
+        key, lambda: _suggestions_pool.submit(_generate_suggestions, resume_str, jd_state)
+    )
+    return key, future
+
+
+def prefetch_suggestions(state, jd_state):
+    """Start generating resume suggestions in the background (no-op if already cached or running)."""
+    resume_str = (state or {}).get("resume_text", "")
+    if resume_str and jd_state:
+        _suggestions_future(resume_str, jd_state)
+
+
+def resume_suggestions(state, jd_state) -> ResumeSuggestions:
+    """Resume suggestions for the current resume and JD, waiting for a running prefetch if there is one."""
+    resume_str = (state or {}).get("resume_text", "")
+    if not resume_str or not jd_state:
+        return ResumeSuggestions(suggestions=[], sample_bullets=[])
+
+    key, future = _suggestions_future(resume_str, jd_state)
+    try:
+        return future.result()
+    except Exception:
+        # Don't cache failures; the next request retries
+        suggestions_cache.delete(key)
+        raise
+
 
 def render_skill_chips(state, metadata_state, jd_state):
     """Render color-coded chips for skills and return suggestions + fit score."""
-    skills_comparison = skills_fit_fn(state, metadata_state, jd_state)
+    return format_skill_chips(skills_fit_fn(state, metadata_state, jd_state))
+
 
+def format_skill_chips(skills_comparison):
+    """Build (fit summary, chips HTML, ATS recommendations) from a SkillsComparison."""
     matched = skills_comparison.matching_skills
     missing = skills_comparison.missing_skills
     ats_recs = skills_comparison.ats_recommendations
@@ -52,3 +110,13 @@ def render_skill_chips(state, metadata_state, jd_state):
     fit_summary = f"✅ Fit Score: {skills_comparison.fit_score:.1f}/100\nReasoning: {skills_comparison.fit_reasoning}"
 
     return fit_summary, html, ats_recs
+
+
+def format_suggestions(suggestions):
+    """Markdown for ResumeSuggestions: improvement ideas followed by sample bullets."""
+    if not suggestions.suggestions and not suggestions.sample_bullets:
+        return "No suggestions available."
+    lines = ["**Suggestions**"] + [f"- {s}" for s in suggestions.suggestions]
+    if suggestions.sample_bullets:
+        lines += ["", "**Sample bullets**"] + [f"- {b}" for b in suggestions.sample_bullets]
+    return "\n".join(lines)